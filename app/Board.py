@@ -3,14 +3,18 @@ Calculate best path and path benefits.
 Includes vertices and edges.
 """
 
-import colorsys
+from collections import OrderedDict
 import numpy as np
 #import igraph
+from scipy.sparse import csr_matrix
 from scipy.sparse.csgraph import dijkstra
-#try:
-#    from appJar import gui
-#except ImportError:
-#    print('Failed to import appJar')
+from app.util.BucketSearch import BucketSearch
+from app.util.AStarSearch import AStarSearch
+from app.util.BreadthFirstSearch import BreadthFirstSearch
+from app.util.Renderer import Renderer
+from app.util.Layers import Layers
+from app.util.Neighbours import Neighbours
+from app.obj.Path import Path
 
 
 class Board:
@@ -25,6 +29,8 @@ __init__                void        Board initialization
 averageWeights          void        Balance weight values using heat equation
 modifyWeights           void        Operate on array of vertexes by array of
                                         weights (parent for next four functions)
+applyWeights            void        Operate on many vertexes, given as a mask
+                                        or coordinate array, in one vectorized step
 multiplyWeight          void        Multiply weight of node by multiplier
 divideWeight            void        Divide weight of node by divisor
 addWeight               void        Increase weight of node by addend
@@ -35,11 +41,17 @@ subtractWeight          void        Decrease weight of node by subtrahend
 getNodeWithPriority     [x,y]       Return vertex name with priority of some value
 getNodesWithPriority    [[x, y]]    Return array of vertexes with priority
                                         between start and end
+getPriorityOrder        np.array    Return flat node indices from highest to
+                                        lowest priority
 getSize                 [int, int]  Get board size as an x, y array
 getWeight               int/float   Return the weight of a node u
+getWeights              np.array    Return the weights of many nodes
 isNodeWeightUnique      boolean     Check if node weight exists in board twice
 countNodeWeightCopies   int         Get the number of copies a specific weight
-optimumPath             [[x, y]]    Get the best path between two nodes
+optimumPath             Path        Get the best path between two nodes
+optimumPathLength       int         Get the number of nodes in the best path
+distanceField           np.array    Get the distance of every node from the
+                                        nearest of some source nodes
 
 ## SETTERS ##
 
@@ -47,38 +59,154 @@ setWeight               void        Set incoming edges of vertex u to some
                                         weight
 setWeights              void        Set incoming edges of array of vertexes to
                                         matching weight in array
+resetWeights            void        Set every weight back to 50
+snapshot                tuple       Save weights and cached paths
+restore                 void        Put back weights and cached paths saved by
+                                        snapshot
+
+## LAYERS ##
+
+layers                  Layers      Named weight grids, combined into the
+                                        board weights by layers.compose()
 
 ## DISPLAY ##
-showWeights             void        Opens visualization of weights of all nodes
-showPath                void        Display graphic of best path between nodes
+showWeights             void        Print visualization of weights of all nodes
+showPath                void        Print graphic of best path between nodes
     """
 
+    # fraction of the board that may be dirty before a full edge refresh is
+    # cheaper than patching cell by cell
+    FULL_REFRESH_RATIO = 0.25
+
+    # number of single-source shortest path results kept per weight version
+    PATH_CACHE_SIZE = 8
+
+    # check arguments on every call. Turn off in production for speed
+    STRICT = True
+
+    # shortest path backends: scipy's general Dijkstra, or our bucket queue
+    ENGINES = ('scipy', 'bucket')
 
-    def __init__(self, width, height):
+    # operators accepted by modifyWeights and applyWeights
+    OPERATORS = {
+        '*': np.multiply,
+        '/': np.floor_divide,
+        '+': np.add,
+        '-': np.subtract,
+    }
+
+    def __init__(self, width, height, engine='scipy', strict=None):
         """
         Initialize the Graph class.
 
         param1: integer - width of board
         param2: integer - height of board
+        param3: string - shortest path backend, one of Board.ENGINES
+        param4: boolean - check the arguments of every call, defaults to
+                    Board.STRICT. Bulk node arrays are always bounds checked
         """
 
-        self.initErrorCheck(width, height)  # comment this out for speed
+        self.strict = self.STRICT if strict is None else strict
+        if self.strict:
+            self.initErrorCheck(width, height, engine)
 
         self.width = width  # declare size of board
         self.height = height
+        self.engine = engine
 
         self.board = np.full((width, height), 50, dtype='f')
 
-        self.adjMatrixOutOfDate = True
-        self.adjMatrix = None
+        # sparse graph where the edge u -> v costs the weight of v. Nodes are
+        # flat indices into self.board, ie. x * height + y
+        indptr, indices, self.incomingEdges = Neighbours.forSize(width, height).getGraph()
+        self.adjMatrix = csr_matrix((np.zeros(len(indices)), indices, indptr),
+                                    shape=(width * height, width * height))
+
+        # flat indices of nodes whose weight changed since the last path query
+        self.dirtyNodes = set()
+        self.allNodesDirty = True
+
+        # changes on every weight change; cached paths from older versions are
+        # stale. Versions come from a counter that never goes back, so a
+        # version restored from a snapshot is never handed out again
+        self.weightVersion = 0
+        self.versionCounter = 0
+        self.resetMask = np.empty((width, height), dtype=bool)
+        self.pathCache = OrderedDict()  # start node -> (distances, predecessors)
+        self.pathCacheVersion = 0
+
+        # weights as a plain list for the pure Python searches
+        self.costList = None
+        self.minCost = None
+        self.costListVersion = None
 
+        # flat indices sorted from highest to lowest priority, and their weights
+        self.priorityOrder = None
+        self.sortedWeights = None
+        self.priorityVersion = None
 
-    def initErrorCheck(self, width, height):
+        # named developer weight grids, combined into self.board by compose()
+        self.layers = Layers(self)
+
+        # double buffers for averageWeights, so diffusing never allocates
+        self.diffusionGrids = (np.empty((width, height)), np.empty((width, height)))
+        self.diffusionFixed = np.empty((width, height), dtype=bool)
+        self.diffusionSources = np.empty((width, height))
+
+        self.renderer = Renderer(self)
+        self.breadthFirstSearch = BreadthFirstSearch(self)
+
+        # pure Python searches, built by their getters the first time they are used
+        self.bucketSearch = None
+        self.aStarSearch = None
+
+
+    def updateAdjMatrix(self):
+        """
+        Copy weights changed since the last update onto the edges of the
+        adjacency matrix. Only the incoming edges of dirty nodes are touched.
+        """
+
+        data = self.adjMatrix.data
+        indices = self.adjMatrix.indices
+        if self.allNodesDirty:
+            data[:] = self.board.ravel()[indices]
+        elif self.dirtyNodes:
+            edges = self.incomingEdges[list(self.dirtyNodes)].ravel()
+            edges = edges[edges >= 0]
+            data[edges] = self.board.ravel()[indices[edges]]
+
+        self.dirtyNodes.clear()
+        self.allNodesDirty = False
+
+
+    def storeWeights(self, xs, ys, weights):
+        """
+        Write normalized weights into the board and mark the nodes dirty.
+        Every change to self.board must go through here.
+
+        param1: int/[int] - x coordinate(s) of nodes
+        param2: int/[int] - y coordinate(s) of nodes
+        param3: float/[float] - normalized weight(s) to store
+        """
+
+        self.board[xs, ys] = weights
+        self.newWeightVersion()
+
+        if not self.allNodesDirty:
+            flat = np.asarray(xs) * self.height + np.asarray(ys)
+            self.dirtyNodes.update(flat.ravel().tolist())
+            if len(self.dirtyNodes) > self.FULL_REFRESH_RATIO * self.board.size:
+                self.allNodesDirty = True
+
+
+    def initErrorCheck(self, width, height, engine='scipy'):
         """
         Check init() for errors.
 
         param1: integer - width to check
         param2: integer - height to check
+        param3: string - engine to check
         """
 
         self.checkInt(width)
@@ -88,6 +216,8 @@ showPath                void        Display graphic of best path between nodes
             raise ValueError('width must be greater than 1')
         if height <= 1:
             raise ValueError('height must be greater than 1')
+        if engine not in self.ENGINES:
+            raise ValueError('engine must be one of ' + ', '.join(self.ENGINES))
 
 
     def checkNode(self, u):
@@ -153,6 +283,22 @@ showPath                void        Display graphic of best path between nodes
         return int(100 - weight)
 
 
+    @staticmethod
+    def normalizeWeights(weights):
+        """
+        Vectorized normalizeWeight() for an array of weights.
+
+        param1: np.array - weights as given by the developer
+        return: np.array - normalized weights
+        """
+
+        weights = np.asarray(weights, dtype=float)
+        normalized = np.trunc(100 - weights)
+        normalized[weights > 100] = 0
+        normalized[weights <= 0] = np.inf
+        return normalized
+
+
     def setWeight(self, u, weight):
         """
         Set willingness of going to node to given weight.
@@ -161,10 +307,11 @@ showPath                void        Display graphic of best path between nodes
         param2: integer/float - weight to set
         """
 
-        self.modifyWeightErrorCheck(u, weight)  # comment this out for speed
+        if self.strict:
+            self.modifyWeightErrorCheck(u, weight)
         weight = self.normalizeWeight(weight)
 
-        self.board[u[0], u[1]] = weight
+        self.storeWeights(u[0], u[1], weight)
 
 
     def resetWeights(self):
@@ -172,27 +319,125 @@ showPath                void        Display graphic of best path between nodes
         Reset all weights to 50.
         """
 
-        self.board = np.full((self.width, self.height), 50, dtype='f')
-        self.adjMatrixOutOfDate = True
+        # refill in place, and only mark the nodes that were not already 50
+        changed = np.not_equal(self.board, 50, out=self.resetMask)
+        count = np.count_nonzero(changed)
+        if count > self.FULL_REFRESH_RATIO * self.board.size:
+            self.board.fill(50)
+            self.allNodesDirty = True
+            self.newWeightVersion()
+        elif count:
+            (xs, ys) = np.nonzero(changed)
+            self.storeWeights(xs, ys, 50)
+
+
+    def newWeightVersion(self):
+        """
+        Move the board on to a weight version that has never been used.
+        """
+
+        self.versionCounter += 1
+        self.weightVersion = self.versionCounter
+
+
+    def snapshot(self):
+        """
+        Save the weights and cached path searches, to be put back by restore().
+        Useful for trying out moves without copying the whole Board.
+
+        return: tuple - saved state, to be passed to restore()
+        """
+
+        return (self.board.copy(), self.weightVersion, self.pathCache.copy(),
+                self.pathCacheVersion)
+
+
+    def restore(self, saved):
+        """
+        Put back the weights and cached path searches saved by snapshot(). Only
+        nodes that changed since then are written, so the adjacency matrix is
+        patched rather than rebuilt.
+
+        param1: tuple - state returned by snapshot()
+        """
+
+        (weights, version, pathCache, pathCacheVersion) = saved
+        (xs, ys) = np.nonzero(np.not_equal(weights, self.board, out=self.resetMask))
+        if xs.size:
+            self.storeWeights(xs, ys, weights[xs, ys])
+
+        # the weights are exactly those of the saved version again
+        self.weightVersion = version
+        self.pathCache = pathCache.copy()
+        self.pathCacheVersion = pathCacheVersion
 
 
     def setWeights(self, nodes, weight):
         """
         Modify a list of node weights.
 
-        param1: [[int, int]] - array of nodes in the form [<integer>, <integer>]
-        param2: float/int - weight to set
+        param1: [[int, int]] - array of nodes in the form [<integer>, <integer>],
+                    or a boolean mask the shape of the board
+        param2: float/int/np.array - weight to set, or one weight per node
+                    (in mask order for masks)
         """
 
-        cols, rows = map(list, zip(*nodes)) # create a lists of columns and rows to be modified
+        # columns and rows to be modified, bounds checked in one pass
+        (cols, rows) = self.nodesToIndices(nodes)
 
-        weight = self.normalizeWeight(weight)
+        if np.ndim(weight):
+            self.storeWeights(cols, rows, self.normalizeWeights(weight))
+        else:
+            if self.strict:
+                self.checkNumber(weight)
+            self.storeWeights(cols, rows, self.normalizeWeight(weight))
+
+
+    def averageWeights(self, iterations=10, sources=None, fixWalls=True):
+        """
+        Balance weight values using the heat equation. Each iteration moves
+        every node to the mean of itself and its four neighbours; nodes on
+        the edge of the board count themselves in place of missing neighbours.
 
-        for i in range(len(nodes)):
-            self.modifyWeightErrorCheck([cols[i], rows[i]], weight)  # comment this out for speed
+        param1: int - number of diffusion steps
+        param2: np.array - boolean mask or (n, 2) array of [x, y] of nodes that
+                    keep their weight and act as heat sources, eg. food
+        param3: boolean - keep walls (weight 0) fixed as cold sources
+        """
+
+        if self.strict:
+            self.checkInt(iterations)
+        (current, following) = self.diffusionGrids
+        fixed = self.diffusionFixed
+        current[:] = self.denormalizeWeights(self.board)
 
-        self.board[cols, rows] = weight
-        self.adjMatrixOutOfDate = True
+        if fixWalls:
+            np.isinf(self.board, out=fixed)
+        else:
+            fixed.fill(False)
+        if sources is not None:
+            fixed[self.nodesToIndices(sources)] = True
+        np.copyto(self.diffusionSources, current)
+
+        for _ in range(iterations):
+            # 5-point stencil, summed in place on slices of the other buffer
+            np.copyto(following, current)
+            following[1:, :] += current[:-1, :]
+            following[:-1, :] += current[1:, :]
+            following[:, 1:] += current[:, :-1]
+            following[:, :-1] += current[:, 1:]
+            following[0, :] += current[0, :]
+            following[-1, :] += current[-1, :]
+            following[:, 0] += current[:, 0]
+            following[:, -1] += current[:, -1]
+            following *= 0.2
+            np.copyto(following, self.diffusionSources, where=fixed)
+            (current, following) = (following, current)
+
+        normalized = self.normalizeWeights(current)
+        (xs, ys) = np.nonzero(normalized != self.board)
+        if xs.size:
+            self.storeWeights(xs, ys, normalized[xs, ys])
 
 
     def modifyWeights(self, operator, nodes, value):
@@ -204,19 +449,100 @@ showPath                void        Display graphic of best path between nodes
         param3: float/int - value to modify by
         """
 
-        self.modifyWeightsErrorCheck(operator)  # comment these out for speed
-        self.checkNumber(value)
-
-        for node in nodes:
-            self.checkNode(node)  # comment this out for speed
-            if operator == '*':
-                self.multiplyWeight(node, value)
-            elif operator == '/':
-                self.divideWeight(node, value)
-            elif operator == '+':
-                self.addWeight(node, value)
-            elif operator == '-':
-                self.subtractWeight(node, value)
+        if self.strict:
+            self.modifyWeightsErrorCheck(operator)
+            self.checkNumber(value)
+
+        self.applyWeights(operator, nodes, value)
+
+
+    def applyWeights(self, operator, nodes, values):
+        """
+        Modify many node weights in one vectorized step. A node listed more
+        than once is changed once per listing, as repeated single node calls
+        would, eg. adding 5 to a node listed twice adds 10.
+
+        param1: string/np.ufunc - operator ('*', '/', '+', '-') or a ufunc
+                    called as ufunc(weights, values)
+        param2: np.array - boolean mask the shape of the board, or nodes as
+                    an (n, 2) array of [x, y]
+        param3: float/int/np.array - value(s) to modify by, broadcast against
+                    the selected nodes
+
+        Raises: ZeroDivisionError
+            if: dividing by zero, as divideWeight() would
+        Raises: ValueError
+            if: any new weight is not a finite number
+        """
+
+        if not callable(operator):
+            self.modifyWeightsErrorCheck(operator)
+            operator = self.OPERATORS[operator]
+        if operator is np.floor_divide and np.any(np.asarray(values) == 0):
+            raise ZeroDivisionError('cannot divide weights by zero')
+        (xs, ys) = self.nodesToIndices(nodes)
+        values = np.broadcast_to(values, xs.shape)
+
+        # repeated listings are applied in rounds, each round changing every
+        # node at most once, so weights are rounded between listings as
+        # they would be by single node calls
+        (nodes, first, inverse) = np.unique(xs * self.height + ys, return_index=True,
+                                            return_inverse=True)
+        inverse = inverse.ravel()
+        rounds = np.zeros(len(inverse), dtype=int)
+        if len(nodes) < len(inverse):
+            # number each listing of a node by how many came before it
+            order = np.argsort(inverse, kind='stable')
+            grouped = inverse[order]
+            rounds[order] = np.arange(len(order)) - np.searchsorted(grouped, grouped)
+
+        (xs, ys) = (xs[first], ys[first])
+        normalized = self.board[xs, ys].astype(float)
+        for listing in range(int(rounds.max()) + 1 if len(rounds) else 0):
+            selected = rounds == listing
+            targets = inverse[selected]
+            with np.errstate(all='ignore'):
+                weights = operator(self.denormalizeWeights(normalized[targets]),
+                                   values[selected])
+            # storing NaN or inf would break the edges, priorities and cost lists
+            if not np.all(np.isfinite(weights)):
+                raise ValueError('weights must be finite numbers')
+            normalized[targets] = self.normalizeWeights(weights)
+        self.storeWeights(xs, ys, normalized)
+
+
+    def nodesToIndices(self, nodes):
+        """
+        Convert a mask or coordinate array into x and y index arrays, checking
+        every node in one pass.
+
+        param1: np.array - boolean mask the shape of the board, an (n, 2) array
+                    of [x, y], or a tuple of x and y numpy arrays, as returned
+                    by np.nonzero. Tuples of points are read like lists
+        return: (np.array, np.array) - x and y coordinates of selected nodes
+        """
+
+        if isinstance(nodes, tuple) and len(nodes) == 2 \
+                and all(isinstance(axis, np.ndarray) for axis in nodes):
+            (xs, ys) = (np.asarray(nodes[0]), np.asarray(nodes[1]))
+        else:
+            nodes = np.asarray(nodes)
+            if nodes.dtype == bool:
+                if nodes.shape != self.board.shape:
+                    raise ValueError('mask must be the same shape as the board')
+                return np.nonzero(nodes)
+            nodes = nodes.reshape(-1, 2)
+            if not nodes.size:
+                nodes = nodes.astype(int)  # [] has no integer type to infer
+            (xs, ys) = (nodes[:, 0], nodes[:, 1])
+
+        if xs.size and not (np.issubdtype(xs.dtype, np.integer)
+                            and np.issubdtype(ys.dtype, np.integer)):
+            raise ValueError('indices should be integers')
+        if xs.size and (xs.min() < 0 or xs.max() >= self.width
+                        or ys.min() < 0 or ys.max() >= self.height):
+            raise ValueError('node is out of bounds')
+        return (xs, ys)
 
 
     @staticmethod
@@ -240,7 +566,8 @@ showPath                void        Display graphic of best path between nodes
         param2: integer/float - number to multiply weight by
         """
 
-        self.modifyWeightErrorCheck(u, multiplier)  # comment this out for speed
+        if self.strict:
+            self.modifyWeightErrorCheck(u, multiplier)
 
         self.setWeight(u, self.getWeight(u) * multiplier)
 
@@ -253,7 +580,8 @@ showPath                void        Display graphic of best path between nodes
         param2: integer/float - number to divide weight by
         """
 
-        self.modifyWeightErrorCheck(u, divisor)  # comment this out for speed
+        if self.strict:
+            self.modifyWeightErrorCheck(u, divisor)
 
         self.setWeight(u, self.getWeight(u) // divisor)
 
@@ -266,7 +594,8 @@ showPath                void        Display graphic of best path between nodes
         param2: integer/float - number to add to weight
         """
 
-        self.modifyWeightErrorCheck(u, addend)  # comment this out for speed
+        if self.strict:
+            self.modifyWeightErrorCheck(u, addend)
 
         self.setWeight(u, self.getWeight(u) + addend)
 
@@ -279,7 +608,8 @@ showPath                void        Display graphic of best path between nodes
         param2: integer/float - number to subtract from weight
         """
 
-        self.modifyWeightErrorCheck(u, subtrahend)  # comment this out for speed
+        if self.strict:
+            self.modifyWeightErrorCheck(u, subtrahend)
 
         self.setWeight(u, self.getWeight(u) - subtrahend)
 
@@ -304,7 +634,8 @@ showPath                void        Display graphic of best path between nodes
         return: integer/float - weight of node u
         """
 
-        self.checkNode(u) # comment this out for speed
+        if self.strict:
+            self.checkNode(u)
         weight = self.board[u[0], u[1]]
         returnable = 0
         if weight < 0:
@@ -314,6 +645,33 @@ showPath                void        Display graphic of best path between nodes
         return int(returnable)
 
 
+    def getWeights(self, nodes):
+        """
+        Return the weights of many nodes, as getWeight() would.
+
+        param1: np.array - boolean mask, (n, 2) array of [x, y], or a tuple of
+                    x and y arrays
+        return: np.array - weight of each node
+        """
+
+        return self.denormalizeWeights(self.board[self.nodesToIndices(nodes)])
+
+
+    @staticmethod
+    def denormalizeWeights(weights):
+        """
+        Convert normalized weights back into developer weights (0, 100).
+
+        param1: np.array - normalized weights
+        return: np.array - developer weights
+        """
+
+        # work in double precision so arithmetic matches plain Python floats
+        weights = np.asarray(weights, dtype=float)
+        # walls (infinite) and anything out of range read as 0
+        return np.trunc(np.where((weights >= 0) & (weights < 100), 100 - weights, 0))
+
+
     def getNodeWithPriority(self, offset):
         """
         Return vertex name with priority offset.
@@ -322,12 +680,13 @@ showPath                void        Display graphic of best path between nodes
         return: [int, int] - node name with priority offset
         """
 
-        self.checkInt(offset) # comment this out for speed
+        if self.strict:
+            self.checkInt(offset)
 
         # get index of nth largest value
-        flatIndex = np.argpartition(self.board.flatten(), offset)[offset]
+        flatIndex = int(self.getPriorityOrder()[offset])
         # '//' operator forces integer division
-        return [flatIndex // self.width, flatIndex % self.width]
+        return [flatIndex // self.height, flatIndex % self.height]
 
 
     def getNodesWithPriority(self, start, end):
@@ -339,12 +698,28 @@ showPath                void        Display graphic of best path between nodes
         return: [[int, int]] - node names with priority from start-end
         """
 
-        self.getNodesWithPriorityErrorCheck(start, end)  # comment for speed
+        if self.strict:
+            self.getNodesWithPriorityErrorCheck(start, end)
+
+        flatIndices = self.getPriorityOrder()[start:end + 1]
+        return np.stack(np.divmod(flatIndices, self.height), axis=1).tolist()
+
+
+    def getPriorityOrder(self):
+        """
+        Return every node ordered from highest to lowest priority. The order
+        is sorted once per weight change and shared by all priority queries.
+
+        return: np.array - flat node indices, highest priority first
+        """
 
-        indices = []
-        for i in range(end - start + 1):
-            indices.append(self.getNodeWithPriority(start + i))
-        return indices
+        if self.priorityVersion != self.weightVersion:
+            flat = self.board.ravel()
+            # stable, so equal weights keep board order between queries
+            self.priorityOrder = np.argsort(flat, kind='stable')
+            self.sortedWeights = flat[self.priorityOrder]
+            self.priorityVersion = self.weightVersion
+        return self.priorityOrder
 
 
     def getNodesWithPriorityErrorCheck(self, start, end):
@@ -383,76 +758,177 @@ showPath                void        Display graphic of best path between nodes
         return: int - Returns number of other nodes with same weight
         """
 
-        self.checkNode(u)  # comment this out for speed
+        if self.strict:
+            self.checkNode(u)
 
-        targetWeight = 100 - self.getWeight(u)
-        # counts non-zero elements within board that satisfy the condition
-        # element == targetWeight
-        return np.count_nonzero(self.board == targetWeight)
+        self.getPriorityOrder()
+        targetWeight = self.board[u[0], u[1]]
+        # equal weights sit next to each other in the sorted priority index
+        return int(np.searchsorted(self.sortedWeights, targetWeight, side='right')
+                   - np.searchsorted(self.sortedWeights, targetWeight, side='left'))
 
 
-    def optimumPath(self, u, v):
+    def optimumPath(self, u, v, astar=False):
         """
         Return shortest path between nodes from u to v.
 
         u: [int, int] - start node in the form [x, y]
         v: [int, int] - end node in the form [x, y]
-        return: [[int, int]] - node names in the optimum path from u to v
+        astar: boolean - search towards v only, stopping once it is reached,
+                        unless a cached search from u already exists
+        return: Path - nodes in the optimum path from u to v, or None if
+                        there is no path
         """
         # credit to https://stackoverflow.com/questions/16329403/
         # and http://codegists.com/snippet/python/dijkstra_examplepy_myjr52_python
         # for assisting in making this method happen
 
-        # Make some nice variables for working with
-        bHeight, bWidth = self.board.shape
-        adjMatrixSide = bHeight * bWidth
-        start = u[1] * bWidth + u[0]
-        end = v[1] * bWidth + v[0]
-
-        # Update the adjacency matrix if it's out-of-date
-        if self.adjMatrixOutOfDate:
-            self.adjMatrixOutOfDate = False
-            self.adjMatrix = np.zeros((adjMatrixSide, adjMatrixSide), dtype=self.board.dtype)
-
-            for y in range(bHeight):
-                for x in range(bWidth):
-                    # map x, y coords to a range from 0 to (bHeight * bWidth)
-                    i = y * bWidth + x
-                    iWeight = self.board[i // bWidth][i % bWidth]
-                    if x > 0:
-                        self.adjMatrix[i - 1, i] = iWeight
-                        self.adjMatrix[i, i - 1] = iWeight
-                    if y > 0:
-                        self.adjMatrix[i - bWidth, i] = iWeight
-                        self.adjMatrix[i, i - bWidth] = iWeight
-
-        # Perform the Djikstra
-        (distances, previous) = dijkstra(self.adjMatrix, indices=start,\
-                                         directed=True, return_predecessors=True)
+        start = u[0] * self.height + u[1]
+        end = v[0] * self.height + v[1]
+
+        if astar and (start not in self.pathCache
+                      or self.pathCacheVersion != self.weightVersion):
+            path = self.getAStarSearch().search(start, end)
+            if path is None:
+                return None
+            return Path(path, self.height)
+
+        (distances, previous) = self.shortestPathTree(start)
 
         # Collect the path between points using the previous array, but avoid if there are no paths
-        path = []
-        i = end
-        if np.isinf(distances[i]):
+        if np.isinf(distances[end]):
             return None
+        nodes = [end]
+        while nodes[-1] != start:
+            nodes.append(int(previous[nodes[-1]]))
+
+        return Path(nodes[::-1], self.height)
+
+
+    def shortestPathTree(self, start):
+        """
+        Return distances and predecessors of every node from start. Results
+        are cached per start node until the weights next change.
+
+        param1: int - flat index of start node
+        return: (np.array, np.array) - distances and predecessors by flat index
+        """
+
+        if self.pathCacheVersion != self.weightVersion:
+            self.pathCache.clear()
+            self.pathCacheVersion = self.weightVersion
+
+        if start in self.pathCache:
+            self.pathCache.move_to_end(start)
+            return self.pathCache[start]
+
+        if self.engine == 'bucket':
+            tree = self.getBucketSearch().shortestPathTree(start)
+        else:
+            # Bring the edges of changed nodes up to date
+            self.updateAdjMatrix()
+
+            # Perform the Djikstra
+            tree = dijkstra(self.adjMatrix, indices=start, directed=True,
+                            return_predecessors=True)
+
+        self.pathCache[start] = tree
+        if len(self.pathCache) > self.PATH_CACHE_SIZE:
+            self.pathCache.popitem(last=False)  # drop least recently used
+        return tree
+
+
+    def distanceField(self, sources, weighted=True):
+        """
+        Return the distance of every node from the nearest source node.
+
+        Weighted distances add up the weights of the nodes entered, as in
+        optimumPath(), and come from Dijkstra. Unweighted distances count moves
+        through non-wall nodes and come from a breadth first search. Sources
+        are at distance 0 even if they are walls, eg. a snake's head.
+
+        param1: [x, y]/np.array - one node, or a mask or (n, 2) array of nodes
+        param2: boolean - add up weights (True) or count moves (False)
+        return: np.array - distances shaped like the board, inf if unreachable
+        """
+
+        (xs, ys) = self.nodesToIndices(sources)
+        if not weighted:
+            return self.breadthFirstSearch.distanceField(xs, ys)
+
+        starts = np.unique(xs * self.height + ys)
+        if len(starts) == 1:
+            distances = self.shortestPathTree(int(starts[0]))[0]
         else:
-            while i != start:
-                path.append([i % bWidth, i // bWidth])
-                i = previous[i]
-            path.append([start % bWidth, start // bWidth])
+            self.updateAdjMatrix()
+            distances = dijkstra(self.adjMatrix, indices=starts, directed=True,
+                                 min_only=True)
+        return distances.reshape(self.width, self.height)
+
+
+    def getCostList(self):
+        """
+        Return node weights as a list, converted again only after the weights
+        change so searches from several sources share one conversion.
+
+        return: [int] - integer weight of each node by flat index, -1 for walls
+        """
+
+        if self.costListVersion != self.weightVersion:
+            costs = self.board.ravel()
+            walls = np.isinf(costs)
+            # walls are marked -1; anything else is truncated to its integer cost
+            self.costList = np.where(walls, -1, costs).astype(int).tolist()
+            self.minCost = int(costs[~walls].min()) if not walls.all() else 0
+            self.costListVersion = self.weightVersion
+        return self.costList
+
+
+    def getMinCost(self):
+        """
+        Return the lowest cost of entering any non-wall node.
+
+        return: int - lowest node cost
+        """
+
+        self.getCostList()
+        return self.minCost
+
+
+    def getBucketSearch(self):
+        """
+        Return the bucket queue search, building it on first use.
+
+        return: BucketSearch - search engine over this board
+        """
+
+        if self.bucketSearch is None:
+            self.bucketSearch = BucketSearch(self)
+        return self.bucketSearch
+
+
+    def getAStarSearch(self):
+        """
+        Return the A* search, building it on first use.
+
+        return: AStarSearch - search engine over this board
+        """
 
-        return path[::-1]
+        if self.aStarSearch is None:
+            self.aStarSearch = AStarSearch(self)
+        return self.aStarSearch
 
 
-    def optimumPathLength(self, u, v):
+    def optimumPathLength(self, u, v, astar=False):
         """
         Return length of optimal path between two vertices.
 
         param1: [int, int] - start node as [x, y]
         param2: [int, int] - end node
+        param3: boolean - use a point-to-point A* search, see optimumPath
         return: int - length of path
         """
-        return len(self.optimumPath(u, v))
+        return self.optimumPath(u, v, astar).getLength()
 
 
     def showWeights(self, colours, numbers):
@@ -463,7 +939,8 @@ showPath                void        Display graphic of best path between nodes
         param2: boolean - show numbers on display?
         """
 
-        self.showWeightsErrorCheck(colours, numbers)  # comment for speed
+        if self.strict:
+            self.showWeightsErrorCheck(colours, numbers)
 
         self.showCombiner([], colours, numbers)
 
@@ -496,45 +973,15 @@ showPath                void        Display graphic of best path between nodes
 
     def showCombiner(self, pathValues, colours, numbers):
         """
-        Visualize weights of each node.
+        Print weights of each node to the terminal.
 
-        param1: array - path nodes to colour
+        param1: Path/array - path nodes to colour
         param1: boolean - show colours on display?
         param2: boolean - show numbers on display?
         """
 
-        app = gui('Login Window', '950x950')
-        app.setBg('white')
-        app.setTitle('SneakySnake Visualiser')
-
-        for row in range(self.height):
-            for col in range(self.width):
-
-                nodeName = str(row) + ',' + str(col)
-                weight = self.getWeight([col, row])
-
-                # interpolate square value from gridValue into HSV value
-                # between red and green, convert to RGB, convert to hex
-                hexCode = '#%02x%02x%02x' % tuple(i * 255 for i in
-                            colorsys.hls_to_rgb((weight * 1.2) /
-                            float(360), 0.6, 0.8))
-                if weight == 0: # color perfect non-valid entries black
-                    hexCode = '#000000'
-                if weight == 100: # color perfect full-valid entries blue
-                    hexCode = '#0033cc'
-                if weight > 100 or (weight != float('-inf') and weight < 0):
-                    # color invalid entries grey
-                    hexCode = '#616161'
-                if [row, col] in pathValues:
-                    # color path values cyan
-                    hexCode = '#66ffff'
-
-                if numbers: # add numbers
-                    app.addLabel(nodeName, '%.2f' % weight, col, row)
-                else:
-                    app.addLabel(nodeName, '', col, row)
-
-                if colours is True: # add colours
-                    app.setLabelBg(nodeName, hexCode)
-
-        app.go() # show window
+        if colours:
+            print(self.renderer.toAnsi(pathValues, numbers))
+        elif numbers:
+            weights = self.denormalizeWeights(self.board).T
+            print('\n'.join(' '.join('%3d' % weight for weight in row) for row in weights))
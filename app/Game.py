@@ -106,6 +106,7 @@ class Game:
         self.processor.weightFood()
         self.processor.weightSmallSnakes()
         self.processor.weightLargeSnakes()
+        self.board.layers.compose()
 
         self.board.setEdges()
 
@@ -5,7 +5,8 @@ class Food:
     Tracks all food in the game.
 
     Has the following attributes:
-    positions       [[x,y]]  - list of food positions
+    positions       [[x,y]]  - list of food positions, empty until the server
+                                sends the first list
     """
 
     def __init__(self, foodList):
@@ -17,7 +18,7 @@ class Food:
         if 'data' in foodList:
             self.positions = list(map(lambda point: [point['x'], point['y']], foodList['data']))
         else:
-            self.positions = [[]]
+            self.positions = []
 
     def update(self, foodList):
         """
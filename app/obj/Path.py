@@ -0,0 +1,102 @@
+"""Path object returned by Board path searches."""
+
+import numpy as np
+
+
+class Path:
+    """
+    A path across the board, stored as flat node indices. Coordinates are
+    only decoded when asked for, so checking the length or the first step
+    stays cheap.
+
+    Has the following attributes:
+    nodes           np.array        - flat indices (x * height + y) of the
+                                        path, start first
+    height          int             - height of the board the path is on
+    coords          [[x,y]]         - decoded nodes, filled in when first used
+    """
+
+    def __init__(self, nodes, height):
+        """
+        Initialize the Path class.
+
+        param1: [int] - flat indices of nodes from start to end
+        param2: int - height of the board
+        """
+
+        self.nodes = np.asarray(nodes, dtype=int)
+        self.height = height
+        self.coords = None
+
+    def getLength(self):
+        """
+        Return number of nodes in the path, including start and end.
+        return: int - path length
+        """
+
+        return len(self.nodes)
+
+    def getNodes(self):
+        """
+        Return flat indices of the nodes in the path.
+        return: np.array - flat indices from start to end
+        """
+
+        return self.nodes
+
+    def getFirstStep(self):
+        """
+        Return the node moved to first, or None if the path has no moves.
+        return: array - as [x, y] coords
+        """
+
+        if len(self.nodes) < 2:
+            return None
+        return self.decode(self.nodes[1])
+
+    def getCoordinates(self):
+        """
+        Return every node in the path.
+        return: array[array] - [x,y] of all nodes from start to end
+        """
+
+        if self.coords is None:
+            self.coords = np.stack(np.divmod(self.nodes, self.height), axis=1).tolist()
+        return self.coords
+
+    def decode(self, node):
+        """
+        Convert one flat index into coordinates.
+
+        param1: int - flat index
+        return: array - as [x, y] coords
+        """
+
+        return [int(node) // self.height, int(node) % self.height]
+
+    def __len__(self):
+        return self.getLength()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.getCoordinates()[index]
+        return self.decode(self.nodes[index])
+
+    def __iter__(self):
+        return iter(self.getCoordinates())
+
+    def __contains__(self, coord):
+        return coord in self.getCoordinates()
+
+    def __eq__(self, other):
+        if isinstance(other, Path):
+            return self.height == other.height and np.array_equal(self.nodes, other.nodes)
+        if other is None:
+            return False
+        return self.getCoordinates() == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return 'Path(' + str(self.getCoordinates()) + ')'
@@ -0,0 +1,65 @@
+"""Point-to-point shortest paths over our grid. Searches towards a single
+target with A* and stops as soon as that target is settled."""
+
+import heapq
+from app.util.Neighbours import Neighbours
+
+
+class AStarSearch:
+    """A* search over a Board with a Manhattan distance heuristic.
+
+    Has following attributes:
+    board           Board       - Board object
+    neighbours      Neighbours  - neighbour tables for the board's size
+    """
+
+    def __init__(self, board):
+        """
+        Initialize the A* search.
+
+        param1: Board - board object
+        """
+        self.board = board
+        self.neighbours = Neighbours.forSize(board.width, board.height)
+
+    def search(self, start, end):
+        """
+        Return the cheapest path from start to end.
+
+        Every step enters a node costing at least the board's lowest cost,
+        so Manhattan distance times that cost never overestimates and the
+        first time end is popped its path is optimal.
+
+        param1: int - flat index of start node
+        param2: int - flat index of end node
+        return: [int] - flat indices of the path from start to end inclusive,
+                        or None if end is unreachable
+        """
+        relax = self.neighbours.relax
+        costs = self.board.getCostList()
+        minCost = self.board.getMinCost()
+        height = self.board.height
+        (endX, endY) = divmod(end, height)
+
+        distances = [float('inf')] * len(costs)
+        previous = [None] * len(costs)
+        distances[start] = 0
+        (x, y) = divmod(start, height)
+        queue = [((abs(x - endX) + abs(y - endY)) * minCost, 0, start)]
+        while queue:
+            (_, distance, node) = heapq.heappop(queue)
+            if node == end:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path[::-1]
+            if distance > distances[node]:
+                continue  # already expanded through a cheaper path
+
+            for (neighbour, newDistance) in relax(node, distance, costs, distances, previous):
+                (x, y) = divmod(neighbour, height)
+                estimate = newDistance + (abs(x - endX) + abs(y - endY)) * minCost
+                heapq.heappush(queue, (estimate, newDistance, neighbour))
+
+        return None
@@ -0,0 +1,58 @@
+"""Unweighted distances over our grid. Every move costs the same, so the whole
+frontier can grow one move at a time with array shifts instead of a queue."""
+
+import numpy as np
+
+
+class BreadthFirstSearch:
+    """Multi-source breadth first search over a Board's non-wall nodes.
+
+    Has following attributes:
+    board           Board       - Board object
+    frontier        np.array    - nodes first reached on the last move
+    grown           np.array    - nodes first reached on the next move
+    """
+
+    def __init__(self, board):
+        """
+        Initialize the breadth first search.
+
+        param1: Board - board object
+        """
+        self.board = board
+
+        # reused by every search, so growing the frontier never allocates
+        self.frontier = np.empty((board.width, board.height), dtype=bool)
+        self.grown = np.empty((board.width, board.height), dtype=bool)
+
+    def distanceField(self, xs, ys):
+        """
+        Return the number of moves from the nearest source to every node.
+
+        param1: np.array - x coordinates of sources
+        param2: np.array - y coordinates of sources
+        return: np.array - distances shaped like the board, inf if unreachable
+        """
+        weights = self.board.board
+        (frontier, grown) = (self.frontier, self.grown)
+
+        distances = np.full(weights.shape, np.inf)
+        unvisited = ~np.isinf(weights)
+        frontier.fill(False)
+        frontier[xs, ys] = True
+        distances[frontier] = 0
+        unvisited &= ~frontier
+
+        moves = 0
+        while frontier.any():
+            moves += 1
+            grown.fill(False)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown &= unvisited
+            unvisited &= ~grown
+            distances[grown] = moves
+            (frontier, grown) = (grown, frontier)
+        return distances
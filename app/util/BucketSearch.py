@@ -0,0 +1,66 @@
+"""Shortest paths specialised for our grid. Board weights are small integers
+(0..100, or infinity for walls), so a bucket queue (Dial's algorithm) can
+replace the binary heap of a general Dijkstra."""
+
+import numpy as np
+from app.util.Neighbours import Neighbours
+
+
+class BucketSearch:
+    """Single-source shortest paths over a Board using a circular bucket queue.
+    An edge u -> v costs the weight of v, as in Board.adjMatrix.
+
+    Has following attributes:
+    board           Board       - Board object
+    neighbours      Neighbours  - neighbour tables for the board's size
+    """
+
+    # largest finite normalized weight; one bucket per possible edge cost
+    MAX_COST = 100
+
+    # predecessor of nodes without one, matching scipy.sparse.csgraph
+    NO_PREDECESSOR = -9999
+
+    def __init__(self, board):
+        """
+        Initialize the bucket search.
+
+        param1: Board - board object
+        """
+        self.board = board
+        self.neighbours = Neighbours.forSize(board.width, board.height)
+
+    def shortestPathTree(self, start):
+        """
+        Return distances and predecessors of every node from start.
+
+        param1: int - flat index of start node
+        return: (np.array, np.array) - distances and predecessors by flat index
+        """
+        relax = self.neighbours.relax
+        numBuckets = self.MAX_COST + 1
+        costs = self.board.getCostList()
+
+        inf = float('inf')
+        distances = [inf] * len(costs)
+        previous = [self.NO_PREDECESSOR] * len(costs)
+        distances[start] = 0
+
+        buckets = [[] for _ in range(numBuckets)]
+        buckets[0].append(start)
+        pending = 1
+        current = 0
+        while pending:
+            bucket = buckets[current % numBuckets]
+            while bucket:
+                node = bucket.pop()
+                pending -= 1
+                if distances[node] != current:
+                    continue  # settled earlier through a cheaper edge
+
+                for (neighbour, distance) in relax(node, current, costs, distances, previous):
+                    buckets[distance % numBuckets].append(neighbour)
+                    pending += 1
+            current += 1
+
+        return (np.array(distances), np.array(previous, dtype=np.int32))
@@ -2,122 +2,320 @@
 what squares are reachable from where."""
 
 import numpy as np
-
-
-class Node(object):
-    """Represents an abstract node in a
-    connected component."""
-
-    def __init__(self, pos):
-        self.pos = pos
-        self.parent = None
-        self.children = set()
-        self.rank = 0
+from scipy import ndimage
+from app.util.Neighbours import Neighbours
 
 
 class DisjointSet:
     """The disjointed set that provides information
     on the connectedness of the board.
 
+    Squares are stored by flat index (x * height + y) in a union-find with
+    union by rank and path halving.
+
     Has following attributes:
     board           Board           - Board object
-    map             {'[x,y]':Node}  - dict mapping coords to Node objects
+    backend         string          - how update() finds components, one of
+                                        DisjointSet.BACKENDS
+    neighbours      Neighbours      - neighbour tables for the board's size
+    parent          [int]           - parent of each square, itself for roots
+                                        and WALL for walls
+    rank            [int]           - upper bound on the height of each root's tree
+    size            [int]           - number of squares under each root
+    labels          np.array        - component id of each square, WALL for
+                                        walls, filled in when first used
+    flat            bool            - True if every square points straight at
+                                        its root, as updateCells needs
     """
 
-    def __init__(self, board):
+    # parent of squares that are walls, and so in no component
+    WALL = -1
+
+    # 'label' labels the whole board at once with scipy.ndimage, 'unionfind'
+    # joins squares one at a time through Board.getWeight. 'label' is faster
+    # on every board size that is played, see utilities/benchmarks
+    BACKENDS = ('label', 'unionfind')
+
+    # 4-connected components; snakes cannot move diagonally
+    STRUCTURE = ndimage.generate_binary_structure(2, 1)
+
+    def __init__(self, board, backend='label'):
         """
         Initialize the disjoint set.
-        
+
         param1: Board - Board object
+        param2: string - update() backend, one of DisjointSet.BACKENDS
+
+        Raises: ValueError
+            if: backend is not one of DisjointSet.BACKENDS
         """
+        if backend not in self.BACKENDS:
+            raise ValueError('backend must be one of ' + ', '.join(self.BACKENDS))
         self.board = board
-        self.map = np.empty((board.width, board.height), dtype=object) # maps coords to Node objects
-        
+        self.backend = backend
+        self.neighbours = Neighbours.forSize(board.width, board.height)
+
+        # until the first update every square is a wall
+        area = board.width * board.height
+        self.parent = [self.WALL] * area
+        self.rank = [0] * area
+        self.size = [0] * area
+        self.labels = None
+        self.flat = True
+
     def update(self):
         """
         Update connectivity based on Snake objects.
         """
-        self.map = np.empty((self.board.width, self.board.height), dtype=object)
-        boardWidth = self.board.width
+        if self.backend == 'label':
+            self.updateFromLabels()
+            return
+
         boardHeight = self.board.height
-        for x in range(boardWidth):
-            for y in range(boardHeight):
-                weight = self.board.getWeight([x, y])
-                if weight is 0:
+        area = self.board.width * boardHeight
+        self.parent = parent = list(range(area))
+        self.rank = [0] * area
+        self.size = [1] * area
+        self.labels = None
+
+        # only the left and up neighbours have been seen when a square is reached
+        table = self.neighbours.getTable()[:, [0, 3]].tolist()
+        for node in range(area):
+            weight = self.board.getWeight(list(divmod(node, boardHeight)))
+            if weight == 0:
+                parent[node] = self.WALL
+                self.size[node] = 0
+                continue
+
+            for adjacent in table[node]:
+                if adjacent != Neighbours.PADDING and parent[adjacent] != self.WALL:
+                    self.union(adjacent, node)
+        self.flatten()
+
+    def updateFromLabels(self):
+        """
+        Rebuild every component from one labelling of the board's free squares.
+        """
+        everywhere = np.ones((self.board.width, self.board.height), dtype=bool)
+        # getWeight() truncates, so weights below 1 are walls too
+        self.updateFromMask(self.board.getWeights(everywhere).reshape(everywhere.shape) >= 1)
+
+    def updateFromMask(self, free):
+        """
+        Rebuild every component from a mask of the squares that are free,
+        for callers that decide what is passable without board weights.
+        Each component's root is its lowest flat index.
+
+        param1: np.array - booleans shaped like the board, True if free
+        """
+        area = self.board.width * self.board.height
+        (labels, count) = ndimage.label(free, structure=self.STRUCTURE)
+        labels = labels.ravel()
+        (_, firstSquares) = np.unique(labels, return_index=True)
+        roots = np.full(count + 1, self.WALL)
+        roots[1:] = firstSquares[-count:] if count else []
+        parent = roots[labels]
+        size = np.zeros(area, dtype=int)
+        size[roots[1:]] = np.bincount(labels, minlength=count + 1)[1:]
+
+        self.parent = parent.tolist()
+        self.rank = [0] * area
+        self.size = size.tolist()
+        self.labels = parent.reshape(self.board.width, self.board.height)
+        self.flat = True
+
+    def flatten(self):
+        """
+        Point every square straight at its root, so the incremental updates
+        can tell components apart by parent alone.
+        """
+        self.parent = self.getLabels().ravel().tolist()
+        self.flat = True
+
+    def updateCells(self, freed, blocked):
+        """
+        Update connectivity from the squares that changed since the last
+        update, eg. tails that moved away and heads that moved in. Work grows
+        with the number of changed squares and the size of the smaller side
+        of any merge or split, not with the area of the board.
+
+        param1: [[x,y]] - squares that were walls and are now free
+        param2: [[x,y]] - squares that were free and are now walls
+        """
+        if not self.flat:
+            self.flatten()
+        blockedNodes = set(self.getNode(coord) for coord in blocked)
+        for node in set(self.getNode(coord) for coord in freed) - blockedNodes:
+            if self.parent[node] == self.WALL:
+                self.freeNode(node)
+        for node in blockedNodes:
+            if self.parent[node] != self.WALL:
+                self.blockNode(node)
+        self.labels = None
+
+    def freeNode(self, node):
+        """
+        Turn a wall into a free square, merging the components around it. The
+        smaller components are relabelled into the largest one.
+
+        param1: int - flat index of a wall square
+        """
+        parent = self.parent
+        adjacent = {}
+        for neighbour in self.neighbours.getLists()[node]:
+            if parent[neighbour] != self.WALL:
+                adjacent.setdefault(parent[neighbour], neighbour)
+
+        if not adjacent:
+            (parent[node], self.rank[node], self.size[node]) = (node, 0, 1)
+            return
+
+        largest = max(adjacent, key=lambda root: self.size[root])
+        for (root, start) in adjacent.items():
+            if root != largest:
+                self.relabel(start, root, largest)
+                self.size[largest] += self.size[root]
+                self.size[root] = 0
+        parent[node] = largest
+        self.size[largest] += 1
+
+    def blockNode(self, node):
+        """
+        Turn a free square into a wall, splitting its component if the square
+        held it together. Searches from each neighbour run a step at a time
+        in turn, so only pieces that are cut off are explored in full.
+
+        param1: int - flat index of a free square
+        """
+        parent = self.parent
+        lists = self.neighbours.getLists()
+        root = parent[node]
+        parent[node] = self.WALL
+        self.size[root] -= 1
+        starts = [adjacent for adjacent in lists[node] if parent[adjacent] == root]
+
+        # group[i] is the search that search i has met, like a tiny union-find
+        group = list(range(len(starts)))
+        def top(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        owner = dict((start, i) for (i, start) in enumerate(starts))
+        queues = [[start] for start in starts]
+        visited = [[start] for start in starts]
+        running = set(group)
+        while len(running) > 1:
+            for i in range(len(starts)):
+                if not queues[i]:
                     continue
-                
-                newNode = Node([x, y])
-                self.map[x, y] = newNode
-                
-                surrounding = self.getSurrounding([x, y])                
-                for coord in surrounding:
-                    adjacentNode = self.map[coord[0], coord[1]]
-                    if adjacentNode is not None:
-                        self.union(adjacentNode, newNode)
+                current = queues[i].pop()
+                for adjacent in lists[current]:
+                    if parent[adjacent] != root:
+                        continue
+                    if adjacent in owner:
+                        (mine, theirs) = (top(i), top(owner[adjacent]))
+                        if mine != theirs:
+                            group[mine] = theirs
+                    else:
+                        owner[adjacent] = i
+                        visited[i].append(adjacent)
+                        queues[i].append(adjacent)
+            running = set(top(i) for i in range(len(starts)) if queues[i])
+
+        # every piece but the keeper was explored in full
+        pieces = {}
+        for i in range(len(starts)):
+            pieces.setdefault(top(i), []).extend(visited[i])
+        if running:
+            keeper = running.pop()
+        elif pieces:
+            keeper = max(pieces, key=lambda g: len(pieces[g]))
+        else:
+            return  # the square was a component of its own
+        cutOff = [piece for (g, piece) in pieces.items() if g != keeper]
+        keeperSize = self.size[root] - sum(len(piece) for piece in cutOff)
+
+        # squares only point at root now, so a root that was blocked or cut
+        # off hands the keeper a root of its own
+        if root == node or (root in owner and top(owner[root]) != keeper):
+            keeperRoot = starts[keeper]
+            self.relabel(keeperRoot, root, keeperRoot)
+            self.size[root] = 0
+            (self.rank[keeperRoot], self.size[keeperRoot]) = (0, keeperSize)
+        else:
+            self.size[root] = keeperSize
+
+        for piece in cutOff:
+            for member in piece:
+                parent[member] = piece[0]
+            (self.rank[piece[0]], self.size[piece[0]]) = (0, len(piece))
+
+    def relabel(self, start, old, new):
+        """
+        Point every square of a component at a new root, walking the board
+        from one of its squares.
+
+        param1: int - flat index of a square in the component
+        param2: int - root the component's squares point at now
+        param3: int - root to point them at instead
+        """
+        parent = self.parent
+        lists = self.neighbours.getLists()
+        parent[start] = new
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for neighbour in lists[current]:
+                if parent[neighbour] == old:
+                    parent[neighbour] = new
+                    stack.append(neighbour)
 
     def getSurrounding(self, coord):
         """
         Find the squares surrounding a coordinate.
-        
+
         param1: [x,y] - square to search around
         return: [[x,y]] - surrounding squares
         """
-        x = coord[0]
-        y = coord[1]
-        surrounding = []
-        if (x - 1) >= 0:
-            surrounding.append([x - 1, y])
-        if (x + 1) < self.board.width:
-            surrounding.append([x + 1, y])
-        if (y + 1) < self.board.height:
-            surrounding.append([x, y + 1])
-        if (y - 1) >= 0:
-            surrounding.append([x, y - 1])
-        return surrounding
+        return self.neighbours.getNeighbours(coord)
 
     def find(self, child):
         """
-        Determines the root of a given Node.
+        Determines the root of a given square, halving the path to it on the way.
 
-        param1: Node - child to find the root of
-        return: Node - root of the child
+        param1: int - flat index of the square to find the root of
+        return: int - flat index of the root, or None for walls
         """
-        if child is None:
+        if child is None or self.parent[child] == self.WALL:
             return None
-        parent = child.parent
-        if parent is None:
-            return child
-        else:
-            return self.find(parent)
+        parent = self.parent
+        while parent[child] != child:
+            parent[child] = parent[parent[child]]
+            child = parent[child]
+        return child
 
     def union(self, node1, node2):
         """
         Provides a way for 2 disconnected components to connect.
 
-        param1: Node - first component to connect
-        param2: Node - second component to connect
+        param1: int - flat index of a square in the first component
+        param2: int - flat index of a square in the second component
         """
         root1 = self.find(node1)
-        rank1 = root1.rank
         root2 = self.find(node2)
-        rank2 = root2.rank
-        
+
         if root1 == root2: # already connected
             return
-        
-        if rank1 < rank2:
-            root1.parent = root2
-            root2.children.add(root1)
-            root2.children.update(root1.children)
-        elif rank1 > rank2:
-            root2.parent = root1
-            root1.children.add(root2)
-            root1.children.update(root2.children)
-        else:
-            root1.parent = root2
-            root2.rank = rank2 + 1
-            root2.children.add(root1)
-            root2.children.update(root1.children)
+
+        if self.rank[root1] > self.rank[root2]:
+            (root1, root2) = (root2, root1)
+        elif self.rank[root1] == self.rank[root2]:
+            self.rank[root2] += 1
+        self.parent[root1] = root2
+        self.size[root2] += self.size[root1]
+        self.labels = None
+        self.flat = False
 
     def getConnectedToNode(self, coord):
         """
@@ -126,34 +324,77 @@ class DisjointSet:
         param1: [x,y] - name of square to find connected components from
         return: [[x,y]] - list of connected squares
         """
-        child = self.map[coord[0], coord[1]]
-        if child is None:
+        root = self.find(self.getNode(coord))
+        if root is None:
             raise ValueError('Node is a wall')
-        root = self.find(child)
 
-        returnable = [node.pos for node in root.children] + [root.pos]
-        returnable.remove(coord)
+        returnable = self.getMembers(root)
+        returnable.remove(list(coord))
         return returnable
 
     def getConnectedToWall(self, coord):
         """
-        Return list of squares connected to the provided wall position.
+        Return how many squares can be reached from the provided wall position.
 
         param1: [x,y] - name of wall to find connected components from
-        return: [[x,y]] - list of connected squares
+        return: int - total size of the components next to the wall
         """
-        child = self.map[coord[0], coord[1]]
-        if child is not None:
+        if self.find(self.getNode(coord)) is not None:
             raise ValueError('Node is not a wall')
 
-        surroundingCoords = self.getSurrounding(coord)
-        surroundingRoots = [self.find(self.getNode(coord)) for coord in surroundingCoords]
-        surroundingFiltered = set([node for node in surroundingRoots if node is not None])
+        return sum(self.size[root] for root in self.getSurroundingRoots(coord))
+
+    def getAreaByDirection(self, coord):
+        """
+        Return how many squares can be reached through each move from a square.
+        Moves into the same component report the same area.
+
+        param1: [x,y] - square to move from
+        return: {string:int} - dict of directions to component sizes, 0 for walls
+        """
+        return {direction: self.getComponentSize(adjacent)
+                for (direction, adjacent) in self.neighbours.getDirections(coord).items()}
+
+    def getComponentId(self, coord):
+        """
+        Return the component a square belongs to.
+
+        param1: [x,y] - square to look up
+        return: int - flat index of the component's root, or None for walls
+        """
+        return self.find(self.getNode(coord))
+
+    def getComponentSize(self, coord):
+        """
+        Return the number of squares in the component a square belongs to.
 
-        reachable = []
-        for node in surroundingFiltered:
-            reachable += self.getConnectedToNode(node)
-        return reachable
+        param1: [x,y] - square to look up
+        return: int - component size, 0 for walls
+        """
+        root = self.find(self.getNode(coord))
+        if root is None:
+            return 0
+        return self.size[root]
+
+    def getLabels(self):
+        """
+        Return the component id of every square. Built once per update by
+        pointer jumping over the whole parent array.
+
+        return: np.array - component ids shaped like the board, WALL for walls
+        """
+        if self.labels is None:
+            parent = np.array(self.parent)
+            free = parent != self.WALL
+            roots = np.where(free, parent, np.arange(len(parent)))
+            while True:
+                jumped = roots[roots]
+                if np.array_equal(jumped, roots):
+                    break
+                roots = jumped
+            roots[~free] = self.WALL
+            self.labels = roots.reshape(self.board.width, self.board.height)
+        return self.labels
 
     def pathExistsFromNode(self, coord1, coord2):
         """
@@ -163,13 +404,13 @@ class DisjointSet:
         param2: [x,y] - second node position
         return: bool - True if connected, False otherwise
         """
-        node1 = self.map[coord1[0], coord1[1]]
-        node2 = self.map[coord2[0], coord2[1]]
-        if node1 is None or node2 is None:
+        root1 = self.find(self.getNode(coord1))
+        root2 = self.find(self.getNode(coord2))
+        if root1 is None or root2 is None:
             raise ValueError('One of the nodes is a wall')
-        
-        return self.find(node1) == self.find(node2)
-    
+
+        return root1 == root2
+
     def pathExistsFromWall(self, coord1, coord2):
         """
         Determine if a wall square and a free square are connected.
@@ -178,39 +419,56 @@ class DisjointSet:
         param2: [x,y] - free-space node position
         return: bool - True if connected, False otherwise
         """
-        node1 = self.map[coord1[0], coord1[1]]
-        node2 = self.map[coord2[0], coord2[1]]
-        if node1 is not None:
+        if self.find(self.getNode(coord1)) is not None:
             raise ValueError('First node must be a wall')
-        if node2 is None:
+        root2 = self.find(self.getNode(coord2))
+        if root2 is None:
             raise ValueError('Second node cannot be a wall')
 
-        surroundingCoords = self.getSurrounding(coord1)
-        surroundingRoots = [self.find(self.getNode(coord)) for coord in surroundingCoords]
-        surroundingFiltered = set([node for node in surroundingRoots if node is not None])
-        
-        connected = False
-        for root in surroundingFiltered:
-            if self.find(root) == self.find(node2):
-                connected = True
-                
-        return connected
+        return root2 in self.getSurroundingRoots(coord1)
+
+    def getSurroundingRoots(self, coord):
+        """
+        Return the components next to a square.
+
+        param1: [x,y] - square to search around
+        return: {int} - flat indices of the roots of neighbouring components
+        """
+        roots = set(self.find(self.getNode(adjacent)) for adjacent in self.getSurrounding(coord))
+        roots.discard(None)
+        return roots
+
+    def getMembers(self, root):
+        """
+        Return every square in a component.
+
+        param1: int - flat index of the component's root
+        return: [[x,y]] - squares in the component
+        """
+        return np.argwhere(self.getLabels() == root).tolist()
 
     def getNode(self, coord):
         """
-        Return the Node object that corresponds to a gives square.
+        Return the flat index that corresponds to a given square.
 
         param1: [x,y] - name of the square to find
-        return: Node - object corresponding to square
+        return: int - flat index of the square
         """
-        return self.map[coord[0], coord[1]]
+        return coord[0] * self.board.height + coord[1]
 
     def toString(self, root):
         """
         Provides a way to print out the tree in a human-readable format.
 
-        param1: string - name of root to display from
+        param1: int - flat index of root to display from
         """
-        print('\t'*(5 - root.rank) + str(root.pos)) # NOTE: Incredibly crude implementation
-        for child in root.children:
-            self.toString(child)
+        children = {}
+        for (node, parent) in enumerate(self.parent):
+            if parent != node and parent != self.WALL:
+                children.setdefault(parent, []).append(node)
+
+        def show(node, depth):
+            print('\t' * depth + str(list(divmod(node, self.board.height))))
+            for child in children.get(node, []):
+                show(child, depth + 1)
+        show(root, 0)
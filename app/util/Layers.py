@@ -0,0 +1,162 @@
+"""Named weight layers for a Board. Each heuristic writes its own grid, and one
+composition combines them, in order, into the board's weights."""
+
+import numpy as np
+
+
+class Layers:
+    """Ordered developer weight grids composed into a Board.
+
+    The layers own the whole board: compose() rebuilds every weight from the
+    base weight and the layers, so weights written straight to the board with
+    setWeight() or setWeights() only last until the next composition that has
+    something to change. Heuristics that should survive belong in a layer.
+
+    Has following attributes:
+    board           Board           - Board object
+    layers          {string:np.array} - developer weights of each set layer,
+                                        NaN where the layer has no opinion
+    keys            {string:hashable} - inputs each layer was last built from
+    order           [(string, string)] - (name, mode) of every layer, in order
+    grid            np.array        - buffer the layers are combined in
+    changed         boolean         - True if a layer changed since compose()
+    composedVersion int             - board weight version compose() wrote
+    """
+
+    # how a layer combines with the layers before it. NaN cells in a layer
+    # have no opinion and leave the weight below them alone
+    MODES = {
+        'set': None,
+        'add': np.add,
+        'multiply': np.multiply,
+        'min': np.minimum,
+        'max': np.maximum,
+    }
+
+    # default layers as (name, mode), applied in order on top of the base weight
+    ORDER = (
+        ('snakes', 'set'),
+        ('tails', 'set'),
+        ('food', 'set'),
+        ('smallSnakes', 'add'),
+        ('largeSnakes', 'set'),
+    )
+
+    def __init__(self, board):
+        """
+        Initialize the layers with the default order.
+
+        param1: Board - board object
+        """
+        self.board = board
+        self.layers = {}
+        self.keys = {}
+        self.order = []
+        self.grid = np.empty((board.width, board.height))
+        self.changed = True
+        self.composedVersion = None
+        self.setOrder(self.ORDER)
+
+    def setOrder(self, layers):
+        """
+        Choose the layers composed into the board, and how each one combines
+        with the layers before it. Layers not listed are dropped.
+
+        param1: [(string, string)] - (name, mode) pairs, mode in MODES
+        """
+        for (name, mode) in layers:
+            if mode not in self.MODES:
+                raise ValueError('invalid layer mode ' + str(mode))
+
+        self.order = list(layers)
+        names = [name for (name, _) in layers]
+        for name in list(self.layers):
+            if name not in names:
+                del self.layers[name]
+                self.keys.pop(name, None)
+        self.changed = True
+
+    def set(self, name, weights, key=None):
+        """
+        Replace the weights of a layer. Weights are in developer units, like
+        Board.setWeight(), and NaN marks nodes the layer leaves alone.
+
+        param1: string - name of layer
+        param2: np.array - weights the shape of the board
+        param3: hashable - inputs the weights were built from, see update
+        """
+        if name not in [layer for (layer, _) in self.order]:
+            raise ValueError('unknown layer ' + str(name))
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != self.grid.shape:
+            raise ValueError('layer must be the same shape as the board')
+
+        self.layers[name] = weights
+        self.keys[name] = key
+        self.changed = True
+
+    def update(self, name, key, build):
+        """
+        Rebuild a layer only if the inputs it depends on have changed since
+        it was last built.
+
+        param1: string - name of layer
+        param2: hashable - inputs to the layer, eg. a tuple of snake positions
+        param3: function - returns the layer's weights, called if key changed
+        return: boolean - True if the layer was rebuilt, False if reused
+        """
+        if name in self.layers and key is not None and self.keys[name] == key:
+            return False
+        self.set(name, build(), key)
+        return True
+
+    def get(self, name):
+        """
+        Return the weights of a layer, or None if it has not been set.
+
+        param1: string - name of layer
+        return: np.array - developer weights, NaN where the layer has no opinion
+        """
+        return self.layers.get(name)
+
+    def clear(self, name):
+        """
+        Remove all weights from a layer.
+
+        param1: string - name of layer
+        """
+        if self.layers.pop(name, None) is not None:
+            self.keys.pop(name, None)
+            self.changed = True
+
+    def compose(self, base=50):
+        """
+        Combine every layer, in order, into the board weights. Only nodes
+        whose weight changes are written, and nothing is done if no layer
+        changed and nothing was written to the board since the last composition.
+
+        param1: integer/float - developer weight under all layers
+        """
+        board = self.board
+        if not self.changed and self.composedVersion == board.weightVersion:
+            return
+
+        grid = self.grid
+        grid.fill(base)
+        for (name, mode) in self.order:
+            weights = self.layers.get(name)
+            if weights is None:
+                continue
+            present = ~np.isnan(weights)
+            if mode == 'set':
+                np.copyto(grid, weights, where=present)
+            else:
+                self.MODES[mode](grid, weights, out=grid, where=present)
+
+        normalized = board.normalizeWeights(grid)
+        (xs, ys) = np.nonzero(normalized != board.board)
+        if xs.size:
+            board.storeWeights(xs, ys, normalized[xs, ys])
+
+        self.changed = False
+        self.composedVersion = board.weightVersion
@@ -0,0 +1,176 @@
+"""Precomputed neighbour tables for our grid. Every square's in-bounds neighbours
+are worked out once per board size, instead of with four bounds checks per call."""
+
+import numpy as np
+
+
+class Neighbours:
+    """Neighbour lookups for a board of one size. Get instances with
+    Neighbours.forSize, which shares them between games of the same size.
+
+    Has following attributes:
+    width           int             - width of the board
+    height          int             - height of the board
+    table           np.array        - (width * height, 4) flat indices of each
+                                        node's neighbours in DIRECTIONS order,
+                                        PADDING where off the board
+    degree          np.array        - number of neighbours of each node
+    lists           [[int]]         - flat indices of the in-bounds neighbours
+                                        of each node, by flat index
+    coords          [[(x,y)]]       - in-bounds neighbours of each node, by
+                                        flat index
+    graph           tuple           - CSR arrays of the grid graph, built by
+                                        getGraph the first time it is asked for
+    """
+
+    # direction of each table column, and the [dx, dy] it moves by
+    DIRECTIONS = ('left', 'right', 'down', 'up')
+    OFFSETS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+
+    # table entry of neighbours off the board
+    PADDING = -1
+
+    # tables already built, keyed by (width, height)
+    tables = {}
+
+    def __init__(self, width, height):
+        """
+        Build the neighbour tables of a board.
+
+        param1: int - width of the board
+        param2: int - height of the board
+        """
+        self.width = width
+        self.height = height
+
+        (xs, ys) = np.divmod(np.arange(width * height), height)
+        self.table = np.full((width * height, len(self.OFFSETS)), self.PADDING, dtype=np.int32)
+        for (column, (dx, dy)) in enumerate(self.OFFSETS):
+            (nx, ny) = (xs + dx, ys + dy)
+            inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            self.table[inside, column] = nx[inside] * height + ny[inside]
+        self.degree = (self.table != self.PADDING).sum(axis=1)
+
+        # plain lists and tuples are much faster to hand out than rows of the table
+        self.lists = [[node for node in row if node != self.PADDING]
+                      for row in self.table.tolist()]
+        self.coords = [[divmod(node, height) for node in row] for row in self.lists]
+        self.graph = None
+
+    @classmethod
+    def forSize(cls, width, height):
+        """
+        Return the neighbour tables of a board size, building them the first
+        time that size is seen.
+
+        param1: int - width of the board
+        param2: int - height of the board
+        return: Neighbours - shared tables for that size
+        """
+        key = (width, height)
+        if key not in cls.tables:
+            cls.tables[key] = cls(width, height)
+        return cls.tables[key]
+
+    def getNeighbours(self, coord):
+        """
+        Return the squares next to a square that are on the board.
+
+        param1: [x,y] - square to search around
+        return: [[x,y]] - neighbouring squares, in DIRECTIONS order
+        """
+        return [[x, y] for (x, y) in self.coords[coord[0] * self.height + coord[1]]]
+
+    def getDirections(self, coord):
+        """
+        Return the moves that stay on the board from a square.
+
+        param1: [x,y] - square to move from
+        return: {string:[x,y]} - dict of directions to the squares they reach
+        """
+        row = self.table[coord[0] * self.height + coord[1]]
+        return {direction: list(divmod(int(node), self.height))
+                for (direction, node) in zip(self.DIRECTIONS, row) if node != self.PADDING}
+
+    def getLists(self):
+        """
+        Return the in-bounds neighbours of every node, for inner loops that
+        work on flat indices. The lists are shared and must not be modified.
+
+        return: [[int]] - flat indices of each node's neighbours, by flat index
+        """
+        return self.lists
+
+    def getGraph(self):
+        """
+        Return the CSR index arrays of the 4-neighbour grid graph, building
+        them the first time they are asked for.
+
+        return: (np.array, np.array, np.array) - CSR indptr and indices
+                    arrays, and for each node the positions of its (up to 4)
+                    incoming edges in indices, padded with PADDING
+        """
+        if self.graph is None:
+            size = self.width * self.height
+            nodes = np.arange(size).reshape(self.width, self.height)
+            # every horizontal and vertical neighbour pair, in both directions
+            left, right = nodes[:-1, :].ravel(), nodes[1:, :].ravel()
+            up, down = nodes[:, :-1].ravel(), nodes[:, 1:].ravel()
+            sources = np.concatenate((left, right, up, down))
+            targets = np.concatenate((right, left, down, up))
+
+            order = np.lexsort((targets, sources))  # group by row, sorted columns
+            indices = targets[order].astype(np.int32)
+            indptr = np.zeros(size + 1, dtype=np.int32)
+            indptr[1:] = np.cumsum(np.bincount(sources, minlength=size))
+
+            # group edge positions by target node to find each node's incoming edges
+            byTarget = np.argsort(indices, kind='stable')
+            degree = np.bincount(indices, minlength=size)
+            firstEdge = np.repeat(np.cumsum(degree) - degree, degree)
+            incoming = np.full((size, len(self.OFFSETS)), self.PADDING, dtype=np.int32)
+            incoming[indices[byTarget], np.arange(len(indices)) - firstEdge] = byTarget
+            self.graph = (indptr, indices, incoming)
+
+        return self.graph
+
+    def relax(self, node, distance, costs, distances, previous):
+        """
+        Lower the distance of every neighbour of a node that is cheaper to
+        reach through it. An edge u -> v costs the weight of v, as in
+        Board.adjMatrix, and walls cannot be entered.
+
+        param1: int - flat index of the node being expanded
+        param2: int - distance of that node
+        param3: [int] - cost of entering each node, -1 for walls
+        param4: [int/float] - best distance found to each node, updated in place
+        param5: [int] - predecessor of each node, updated in place
+        return: [(int, int)] - neighbours that got closer, and their new distances
+        """
+        improved = []
+        for neighbour in self.lists[node]:
+            cost = costs[neighbour]
+            if cost < 0:
+                continue
+            newDistance = distance + cost
+            if newDistance < distances[neighbour]:
+                distances[neighbour] = newDistance
+                previous[neighbour] = node
+                improved.append((neighbour, newDistance))
+        return improved
+
+    def getTable(self):
+        """
+        Return the padded neighbour table.
+
+        return: np.array - (width * height, 4) flat indices, PADDING off the board
+        """
+        return self.table
+
+    def getDegree(self):
+        """
+        Return how many neighbours each node has.
+
+        return: np.array - neighbour counts by flat index
+        """
+        return self.degree
@@ -1,11 +1,17 @@
 """Performs grunt work algorithms for decision processing."""
 
 import sys
+import numpy as np
+from app.util.Neighbours import Neighbours
 
 class Processor:
     """The main state machine. Entry point for this file,
     and interface with Game class.
 
+    Each weight heuristic fills its own layer of board.layers, rebuilt only
+    when the snakes or food it is keyed on have moved, and
+    board.layers.compose() then builds the board weights from all of them.
+
     Has following attributes:
     board           Board           - Board object
     width           int             - width of the Board object
@@ -13,8 +19,13 @@ class Processor:
     snakes          {UUID:Snake}    - dict of UUIDs to Snake objects 
     us              UUID            - The UUID of our snake
     food            Food            - Food object representing food coordinates
+    neighbours      Neighbours      - neighbour tables for the board's size
     """
 
+    # default reach of headArea, and the shapes it can take
+    HEAD_AREA_RADIUS = 2
+    HEAD_AREA_SHAPES = ('chebyshev', 'manhattan')
+
     def __init__(self, board, snakes, us, food):
         """
         Initialize the processor.
@@ -32,34 +43,103 @@ class Processor:
         self.us = us
         
         self.food = food
+        self.neighbours = Neighbours.forSize(self.width, self.height)
 
     def weightNotHitSnakes(self):
         """Weight grid to avoid snake hitting other snakes and itself."""
-        # pylint: disable=E1121
-
-        for s in self.snakes:
-            positions = self.snakes[s].getAllPositions()
-            head = positions[0]
-            tail = positions[-1]
-            self.board.setWeights(positions, 0.0)
-            self.board.setWeight(tail, 50.0)
-
-            # if snake could eat food, avoid the tail
-            # above by 1
-            if (head[1]) > 0 and [head[0], head[1] - 1] in self.food:
-                self.board.setWeight(tail, 0.0)
-            # left by 1
-            if (head[0]) < self.width-1 and [head[0] + 1, head[1]] in self.food:
-                self.board.setWeight(tail, 0.0)
-            # right by 1
-            if (head[0]) > 0 and [head[0] - 1, head[1]] in self.food:
-                self.board.setWeight(tail, 0.0)
-            # below
-            if (head[1]) < self.height-1 and [head[0], head[1] + 1] in self.food:
-                self.board.setWeight(tail, 0.0)
+
+        if not self.snakes:
+            # nobody left to avoid, so drop last turn's bodies too
+            self.board.layers.clear('snakes')
+            return
+        self.board.layers.update('snakes', (self.snakesKey(), self.foodKey()),
+                                 self.notHitSnakesLayer)
+
+    def notHitSnakesLayer(self):
+        """
+        Build the layer of weightNotHitSnakes.
+
+        return: np.array - bodies at 0 and safe tails at 50, NaN elsewhere
+        """
+        occupied = self.occupancyMask()
+        heads = np.array([self.snakes[s].getHeadPosition() for s in self.snakes], dtype=int)
+        tails = np.array([self.snakes[s].getTailPosition() for s in self.snakes], dtype=int)
+
+        # if snake could eat food, its tail stays put, so avoid it too.
+        # pad the food mask by one so squares off the board read as no food
+        food = np.pad(self.foodMask(), 1)
+        (x, y) = (heads[:, 0] + 1, heads[:, 1] + 1)
+        nearFood = food[x, y - 1] | food[x + 1, y] | food[x - 1, y] | food[x, y + 1]
+
+        weights = self.emptyLayer()
+        weights[occupied] = 0.0
+        safeTails = tails[~nearFood]
+        weights[safeTails[:, 0], safeTails[:, 1]] = 50.0
+        return weights
+
+    def snakesKey(self):
+        """
+        Return what the snake layers are built from, so unchanged snakes
+        can reuse last turn's layers.
+
+        return: tuple - UUID, positions and size of every snake
+        """
+        return tuple((s, tuple(map(tuple, self.snakes[s].getAllPositions())),
+                      self.snakes[s].getSize()) for s in self.snakes)
+
+    def foodKey(self):
+        """
+        Return what the food layers are built from.
+
+        return: tuple - every food position
+        """
+        return tuple(map(tuple, self.food.getPositions()))
+
+    def emptyLayer(self):
+        """
+        Return a layer that leaves every square alone.
+
+        return: np.array - NaN weights shaped like the board
+        """
+        return np.full((self.width, self.height), np.nan)
+
+    def occupancyMask(self):
+        """
+        Return which squares are taken up by any snake's body, head or tail.
+
+        return: np.array - boolean mask shaped like the board
+        """
+        occupied = np.zeros((self.width, self.height), dtype=bool)
+        bodies = [self.snakes[s].getAllPositions() for s in self.snakes]
+        bodies = [body for body in bodies if len(body)]
+        if bodies:
+            positions = np.concatenate([np.asarray(body, dtype=int) for body in bodies])
+            occupied[positions[:, 0], positions[:, 1]] = True
+        return occupied
+
+    def foodMask(self):
+        """
+        Return which squares have food on them.
+
+        return: np.array - boolean mask shaped like the board
+        """
+        food = np.zeros((self.width, self.height), dtype=bool)
+        positions = self.food.getPositions()
+        if positions:
+            positions = np.asarray(positions, dtype=int)
+            food[positions[:, 0], positions[:, 1]] = True
+        return food
 
     def weightFood(self):
         """Weight grid with food necessity"""
+        self.board.layers.update('food', self.foodKey(), self.foodLayer)
+
+    def foodLayer(self):
+        """
+        Build the layer of weightFood.
+
+        return: np.array - food squares at 100, NaN elsewhere
+        """
         #TODO
         #How desperately do we need food
         #Goes through all food and returns the closest according to optimumPath
@@ -68,9 +148,12 @@ class Processor:
         shortestPath = sys.maxsize
         oursnake = self.snakes[self.us]
         head = oursnake.getHeadPosition()
+        # moves from our head to every square, in one search
+        distances = self.board.distanceField(head, weighted=False)
         # health = oursnake.getHealth()
-        for foodCoords in self.food:
-            pathLength = len(self.board.optimumPath(head, foodCoords))
+        weights = self.emptyLayer()
+        for foodCoords in self.food.getPositions():
+            pathLength = distances[foodCoords[0], foodCoords[1]]
             if pathLength < shortestPath:
                 shortestPath = pathLength
                 #closestFoodCoord = foodCoords
@@ -78,17 +161,29 @@ class Processor:
             #foodCoord += 1
             # this will change based on health decrementation
             foodWeight = 100 # - health - pathLength
-            self.board.setWeight(foodCoords, foodWeight)
+            weights[foodCoords[0], foodCoords[1]] = foodWeight
+        return weights
 
     def weightSmallSnakes(self):
         """Positively weight smaller snakes for murdering purposes"""
+        self.board.layers.update('smallSnakes', self.snakesKey(), self.smallSnakesLayer)
+
+    def smallSnakesLayer(self):
+        """
+        Build the layer of weightSmallSnakes.
+
+        return: np.array - bonus around smaller heads, NaN elsewhere
+        """
         #TODO
         #Compare size
         #How long will it take to get to the snake?
         #How much food is around for the snake to grow?
         oursnake = self.snakes[self.us]
         ourSize = oursnake.getSize()
-        weightAdd = 0
+        occupied = self.occupancyMask()
+        #this algorithm could be altered to add varying values not just a blanket range
+        weightAdd = 12
+        bonus = np.zeros((self.width, self.height))
 
         for otherSnake in self.snakes:
             if otherSnake != self.us:
@@ -96,55 +191,61 @@ class Processor:
                 if  otherSnakeSize < ourSize:
                     # Run this code for every snake on the board that's
                     # not you AND smaller than you
-                    headA = self.headArea(self.snakes[otherSnake])
-                    #this algorithm could be altered to add varying values not just a blanket range
-                    weightAdd = 12
-                    for headCoord in headA:
-                        self.board.addWeight(headCoord, weightAdd)
+                    bonus += weightAdd * self.headArea(self.snakes[otherSnake], occupied=occupied)
 
-    def headArea(self, snake):
-        """Return an area around the head so that it can be weighted
-        param1: snake whose head area needs to be evaluated"""
+        # squares without a bonus are left alone
+        bonus[bonus == 0] = np.nan
+        return bonus
 
-        #TODO
-        #find head
-        #find area
-        #find body
-        #return coordinates
-        head = snake.getHeadPosition()
-        xCoord = head[0]
-        yCoord = head[1]
-        upperBoundX = xCoord+2
-        upperBoundY = yCoord+2
-        lowerBoundX = xCoord-2
-        lowerBoundY = yCoord-2
-        newCoordinates = []
-        if upperBoundY >= self.height:
-            upperBoundY = self.height-1
-        if upperBoundX >= self.width:
-            upperBoundX = self.width-1
-        if lowerBoundY < 0:
-            lowerBoundY = 0
-        if lowerBoundX < 0:
-            lowerBoundX = 0
-        #goes through a 5x5 grid around the snake and creates an array of those coordinates
-        for xCoordNew in range(lowerBoundX, upperBoundX+1):
-            for yCoordNew in range(lowerBoundY, upperBoundY+1):
-                newCoordinates.append([xCoordNew, yCoordNew])
-        #removes any body segments from the grid
-        for otherSnakes in self.snakes:
-            for bodySegment in self.snakes[otherSnakes].getAllPositions():
-                #Run this code for all body (and head) segments of all snakes
-                if bodySegment in newCoordinates:
-                    newCoordinates.remove(bodySegment)
-        #return new bodyless coordinates
-        return newCoordinates
+    def headArea(self, snake, radius=HEAD_AREA_RADIUS, shape='chebyshev', occupied=None):
+        """
+        Return the free squares around a snake's head so that they can be weighted.
+
+        param1: Snake - snake whose head area needs to be evaluated
+        param2: int - how many squares the area reaches out from the head
+        param3: string - 'chebyshev' for a square, 'manhattan' for a diamond
+        param4: np.array - occupancy mask to leave out, or None to build one
+
+        Raises: ValueError
+            if: shape is not one of HEAD_AREA_SHAPES
+
+        return: np.array - boolean mask shaped like the board
+        """
+        if shape not in self.HEAD_AREA_SHAPES:
+            raise ValueError('shape must be one of ' + str(self.HEAD_AREA_SHAPES))
+        if occupied is None:
+            occupied = self.occupancyMask()
+
+        (x, y) = snake.getHeadPosition()
+        (left, right) = (max(x - radius, 0), min(x + radius + 1, self.width))
+        (top, bottom) = (max(y - radius, 0), min(y + radius + 1, self.height))
+
+        area = np.zeros((self.width, self.height), dtype=bool)
+        # window is a view, so filling it fills the area
+        window = area[left:right, top:bottom]
+        if shape == 'manhattan':
+            dx = np.abs(np.arange(left, right) - x)[:, np.newaxis]
+            dy = np.abs(np.arange(top, bottom) - y)[np.newaxis, :]
+            window[...] = (dx + dy) <= radius
+        else:
+            window[...] = True
+        #removes any body segments from the area
+        window &= ~occupied[left:right, top:bottom]
+        return area
 
     def weightLargeSnakes(self):
         """Negatively weight squares where larger snake heads could move to next round"""
+        self.board.layers.update('largeSnakes', self.snakesKey(), self.largeSnakesLayer)
+
+    def largeSnakesLayer(self):
+        """
+        Build the layer of weightLargeSnakes.
 
+        return: np.array - moves of larger heads at 0, NaN elsewhere
+        """
         ourSnake = self.snakes[self.us]
         ourSize = ourSnake.getSize()
+        weights = self.emptyLayer()
         for otherSnake in self.snakes:
             if otherSnake != self.us:
                 otherSnakeSize = self.snakes[otherSnake].getSize()
@@ -152,67 +253,52 @@ class Processor:
                     """Run this code for every snake on the board that's
                     not you AND longer or equal to you"""
                     headCoords = self.snakes[otherSnake].getHeadPosition()
-                    x = headCoords[0]
-                    y = headCoords[1]
-                    """Weight coordinates left and right to 0, provided that
-                    they are within the board indices (0 - width-1)"""
-                    if x > 0:
-                        if x < self.width-1:
-                            self.board.setWeights([[x+1, y], [x-1, y]], 0)
-                        else:
-                            self.board.setWeights([[x-1, y]], 0)
-                    else:
-                        self.board.setWeights([[x+1, y]], 0)
-
-                    """Weight coordinates up and down to 0, provided that
-                    they are within the board indices (0 - height-1)"""
-                    if y > 0:
-                        if y < self.height-1:
-                            self.board.setWeights([[x, y+1], [x, y-1]], 0)
-                        else:
-                            self.board.setWeights([[x, y-1]], 0)
-                    else:
-                        self.board.setWeights([[x, y+1]], 0)
+                    """Weight every square next to their head, within the
+                    board, to 0"""
+                    for (x, y) in self.neighbours.getNeighbours(headCoords):
+                        weights[x, y] = 0
+        return weights
 
     def weightSafeTails(self):
         """Weight locations that will be moved out of next turn as safe"""
+        self.board.layers.update('tails', (self.snakesKey(), self.foodKey()),
+                                 self.safeTailsLayer)
+
+    def safeTailsLayer(self):
+        """
+        Build the layer of weightSafeTails.
+
+        return: np.array - tails that will move at 50, NaN elsewhere
+        """
         #TODO
         #For all snakes whose head is not adjacent to a food:
         #Weight the space occupied by their tail as 50 (or other positive value)
 
+        food = self.foodMask()
+        weights = self.emptyLayer()
         for allSnakes in self.snakes:
             if allSnakes != self.us:
                 #Run this code for ever snake that's not us
                 otherSnakePos = self.snakes[allSnakes].getAllPositions()
                 tailPos = otherSnakePos[-1]
                 headPos = otherSnakePos[0]
-                headX = headPos[0]
-                headY = headPos[1]
-                moveOptions = []
                 foodOpt = False
 
-                #Save possible moves that are within the board (including body)
-                if (headX - 1) >= 0:
-                    moveOptions.append([headX - 1, headY])
-                if (headX + 1) < self.width:
-                    moveOptions.append([headX + 1, headY])
-                if (headY + 1) < self.height:
-                    moveOptions.append([headX, headY + 1])
-                if (headY - 1) >= 0:
-                    moveOptions.append([headX, headY - 1])
-
-                #If any possible move is to food, tail is not safe
-                for coords in moveOptions:
-                    if coords in self.food:
+                #If any possible move within the board is to food, tail is not safe
+                for coords in self.neighbours.getNeighbours(headPos):
+                    if food[coords[0], coords[1]]:
                         #Food is a possible movement
                         foodOpt = True
                         break
 
                 if not foodOpt:
-                    self.board.setWeight(tailPos, 50)
+                    weights[tailPos[0], tailPos[1]] = 50
+        return weights
 
     def weightEnclosedSpaces(self, u):
-        """Negatively weight enclosed spaces to prevent us from going in."""
+        """Negatively weight enclosed spaces to prevent us from going in.
+        Run after board.layers.compose(); the weights written here are only
+        for these searches and are replaced by the next composition."""
 
         # print self.snakes[self.us].getAllPositions()[-1]
         # print u
@@ -223,41 +309,21 @@ class Processor:
         self.board.setWeight(tailPos, 1)
         self.board.setEdges()
         if self.board.optimumPathLength(u, tailPos) != float('inf'):
-            return path[1]
+            return path.getFirstStep()
         us_id = self.us
         for snk in self.snakes: #Set weight of all possible next moves of other snakes to 0.
             if self.snakes[snk].getIdentifier() == us_id:
                 ourSnake = self.snakes[snk]
                 continue
             headPos = self.snakes[snk].getHeadPosition()
-            headX = headPos[0]
-            headY = headPos[1]
-            n = []
-            if (headX - 1) >= 0:
-                n.append([headX-1, headY])
-            if (headX + 1) < self.width:
-                n.append([headX+1, headY])
-            if (headY + 1) < self.height:
-                n.append([headX, headY+1])
-            if (headY - 1) >= 0:
-                n.append([headX, headY-1])
+            n = self.neighbours.getNeighbours(headPos)
             self.board.setWeights(n, 0)
             #self.board.showWeights(True,True)
         ourHead = ourSnake.getHeadPosition()
         path = self.board.optimumPath(ourHead, u) #Current goal
-        otherOptions = []
-        ourHeadX = ourHead[0]
-        ourHeadY = ourHead[1]
-        if (ourHeadX - 1) >= 0:
-            otherOptions.append([ourHeadX-1, ourHeadY])
-        if (ourHeadX + 1) < self.width:
-            otherOptions.append([ourHeadX+1, ourHeadY])
-        if (ourHeadY + 1) < self.height:
-            otherOptions.append([ourHeadX, ourHeadY+1])
-        if (ourHeadY - 1) >= 0:
-            otherOptions.append([ourHeadX, ourHeadY-1])
-
-        otherOptions.remove(path[1]) #Remove from other options our current option
+        otherOptions = self.neighbours.getNeighbours(ourHead)
+
+        otherOptions.remove(path.getFirstStep()) #Remove from other options our current option
         if len(ourSnake.getAllPositions()) > 1 and ourSnake.getAllPositions()[1] in otherOptions:
             # Remove our 'neck' from other otherOptions
             otherOptions.remove(ourSnake.getAllPositions()[1])
@@ -271,7 +337,7 @@ class Processor:
         self.board.setWeights(n, 1)
         if dont:
             return otherOptions[0]
-        return path[1]
+        return path.getFirstStep()
         #TODO
         #set other snake options to 1
         # Do not kill ourselves by picking a corner where we trap ourselves
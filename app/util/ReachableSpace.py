@@ -0,0 +1,138 @@
+"""Measures how much room a snake has. Labels the free squares of the board into
+connected regions in one pass, so the area reachable from any head is a lookup.
+Also finds the area a snake can escape into as the bodies around it move away."""
+
+from collections import deque
+import numpy as np
+from app.util.DisjointSet import DisjointSet
+from app.util.Neighbours import Neighbours
+
+
+class ReachableSpace:
+    """Connected regions of the squares no snake body is standing on.
+
+    Has following attributes:
+    board           Board           - Board object
+    snakes          {UUID:Snake}    - dict of UUIDs to Snake objects
+    neighbours      Neighbours      - neighbour tables for the board's size
+    regions         DisjointSet     - connected regions of the squares free on
+                                        the next move
+    labelled        bool            - True if regions match the free times
+    freeTimes       np.array        - turn on which each square can first be
+                                        entered, 0 if nothing is on it
+    """
+
+    def __init__(self, board, snakes):
+        """
+        Initialize the reachable space.
+
+        param1: Board - board object
+        param2: {UUID:Snake} - dict mapping UUIDs to snakes
+        """
+        self.board = board
+        self.snakes = snakes
+        self.neighbours = Neighbours.forSize(board.width, board.height)
+
+        self.regions = DisjointSet(board)
+        self.labelled = False
+        self.freeTimes = np.zeros((board.width, board.height), dtype=int)
+
+    def update(self):
+        """
+        Recompute when each square frees up from the current snake positions.
+        The regions are only labelled again once getArea or getLabels needs them.
+        """
+        self.freeTimes = np.zeros((self.board.width, self.board.height), dtype=int)
+        bodies = [self.snakes[s].getAllPositions() for s in self.snakes]
+        for body in [body for body in bodies if len(body)]:
+            positions = np.asarray(body, dtype=int)
+            # the tail leaves on the next move, the square before it on the
+            # move after, and so on up to the head. Stacked segments keep
+            # their square until the last of them leaves
+            turns = np.arange(len(body), 0, -1)
+            np.maximum.at(self.freeTimes, (positions[:, 0], positions[:, 1]), turns)
+        self.labelled = False
+
+    def updateLabels(self):
+        """
+        Label the squares that are free on the next move into connected regions.
+        """
+        self.regions.updateFromMask(~self.getBlocked())
+        self.labelled = True
+
+    def getBlocked(self):
+        """
+        Return which squares cannot be entered on the next move. Bodies are
+        walls, except tails, which move away before anyone arrives.
+
+        return: np.array - boolean mask shaped like the board
+        """
+        return self.freeTimes > 1
+
+    def getArea(self, coord):
+        """
+        Return how many squares can be reached by moving from a square. The
+        square itself only counts when it is free and reachable again.
+
+        param1: [x,y] - square to move from, usually a head
+        return: int - number of reachable squares
+        """
+        if not self.labelled:
+            self.updateLabels()
+        roots = self.regions.getSurroundingRoots(coord)
+        return sum(self.regions.size[root] for root in roots)
+
+    def getEscapableArea(self, coord):
+        """
+        Return how many squares can be reached from a square, counting body
+        squares that will have moved away by the time we get there. One breadth
+        first search enters a square only when its arrival time is at least
+        the square's free time. A square reached too early can still be
+        entered later from another side.
+
+        Waiting is not modelled: our own body follows the head, so circling
+        in a pocket until a wall clears is not counted, and a snake that could
+        only escape that way is reported as trapped. Growth from eating is not
+        predicted either, so a snake that eats keeps its tail one turn longer
+        than assumed.
+
+        param1: [x,y] - square to move from, usually a head
+        return: int - number of squares that can be entered
+        """
+        height = self.board.height
+        lists = self.neighbours.getLists()
+        freeTimes = self.freeTimes.ravel().tolist()
+
+        start = coord[0] * height + coord[1]
+        arrived = [False] * len(freeTimes)
+        arrived[start] = True
+        queue = deque([(start, 0)])
+        area = 0
+        while queue:
+            (node, turn) = queue.popleft()
+            turn += 1
+            for neighbour in lists[node]:
+                if not arrived[neighbour] and freeTimes[neighbour] <= turn:
+                    arrived[neighbour] = True
+                    area += 1
+                    queue.append((neighbour, turn))
+        return area
+
+    def getFreeTimes(self):
+        """
+        Return the turn on which each square can first be entered.
+
+        return: np.array - turns shaped like the board, 0 if nothing is on it
+        """
+        return self.freeTimes
+
+    def getLabels(self):
+        """
+        Return the region each square belongs to.
+
+        return: np.array - flat index of each region's root square, shaped
+                    like the board, DisjointSet.WALL if blocked
+        """
+        if not self.labelled:
+            self.updateLabels()
+        return self.regions.getLabels()
@@ -0,0 +1,160 @@
+"""Draws board weights without a display. Turns a weight grid, and optionally
+a path, into an RGB image that can be saved as a PNG or printed to a terminal."""
+
+import struct
+import zlib
+import numpy as np
+
+
+class Renderer:
+    """Headless heatmap renderer for Board weights.
+
+    Weights run from red (0) to green (100) in hue. Walls (0) are black, fully
+    weighted squares (100) are blue and path squares are cyan.
+
+    Has following attributes:
+    board           Board           - Board object
+    """
+
+    WALL_COLOUR = (0, 0, 0)
+    FULL_COLOUR = (0, 51, 204)
+    PATH_COLOUR = (102, 255, 255)
+
+    # saturation and value of the red to green hue scale
+    SATURATION = 0.8
+    VALUE = 0.9
+
+    def __init__(self, board):
+        """
+        Initialize the renderer.
+
+        param1: Board - board object
+        """
+        self.board = board
+
+    def render(self, path=None, scale=1):
+        """
+        Draw the board's current weights.
+
+        param1: Path/[[x,y]] - squares to highlight, or None
+        param2: int - pixels per square along each side
+        return: np.array - uint8 RGB image, shaped (height * scale, width * scale, 3)
+        """
+        weights = self.board.denormalizeWeights(self.board.board)
+        return self.renderWeights(weights, self.pathMask(path), scale)
+
+    def pathMask(self, path):
+        """
+        Convert a path into a mask of the squares on it.
+
+        param1: Path/[[x,y]] - squares on the path, or None
+        return: np.array - boolean mask shaped like the board
+        """
+        mask = np.zeros((self.board.width, self.board.height), dtype=bool)
+        if path is not None and len(path):
+            if hasattr(path, 'getNodes'):
+                mask.ravel()[path.getNodes()] = True
+            else:
+                mask[self.board.nodesToIndices(path)] = True
+        return mask
+
+    @classmethod
+    def renderWeights(cls, weights, pathMask=None, scale=1):
+        """
+        Draw any grid of developer weights, eg. one saved from a replay.
+
+        param1: np.array - weights (0, 100) indexed [x, y]
+        param2: np.array - boolean mask of path squares, or None
+        param3: int - pixels per square along each side
+        return: np.array - uint8 RGB image, shaped (height * scale, width * scale, 3)
+        """
+        weights = np.asarray(weights, dtype=float)
+        rgb = cls.hsvToRgb(weights * 1.2 / 360, cls.SATURATION, cls.VALUE)
+        image = (rgb * 255).astype(np.uint8)
+
+        image[weights <= 0] = cls.WALL_COLOUR
+        image[weights >= 100] = cls.FULL_COLOUR
+        if pathMask is not None:
+            image[pathMask] = cls.PATH_COLOUR
+
+        # board is indexed [x, y], images are rows of y
+        image = image.transpose(1, 0, 2)
+        if scale > 1:
+            image = image.repeat(scale, axis=0).repeat(scale, axis=1)
+        return image
+
+    @staticmethod
+    def hsvToRgb(hue, saturation, value):
+        """
+        Vectorized colorsys.hsv_to_rgb.
+
+        param1: np.array - hues from 0 to 1
+        param2: float/np.array - saturations from 0 to 1
+        param3: float/np.array - values from 0 to 1
+        return: np.array - RGB from 0 to 1, with a last axis of 3
+        """
+        hue = np.asarray(hue, dtype=float) * 6
+        sector = np.floor(hue).astype(int) % 6
+        fraction = hue - np.floor(hue)
+        p = np.broadcast_to(value * (1 - saturation), hue.shape)
+        q = value * (1 - saturation * fraction)
+        t = value * (1 - saturation * (1 - fraction))
+        v = np.broadcast_to(value, hue.shape)
+
+        red = np.choose(sector, [v, q, p, p, t, v])
+        green = np.choose(sector, [t, v, v, q, p, p])
+        blue = np.choose(sector, [p, p, t, v, v, q])
+        return np.stack((red, green, blue), axis=-1)
+
+    @staticmethod
+    def writePNG(filename, image, compression=6):
+        """
+        Save an RGB image as a PNG file, without any imaging library.
+
+        param1: string - file to write
+        param2: np.array - uint8 RGB image shaped (height, width, 3)
+        param3: int - zlib compression level, lower is faster
+        """
+        (height, width) = image.shape[:2]
+        # every row starts with filter type 0 (none)
+        rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+        rows[:, 1:] = image.reshape(height, width * 3)
+
+        def chunk(tag, data):
+            return struct.pack('>I', len(data)) + tag + data + \
+                struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+        with open(filename, 'wb') as pngFile:
+            pngFile.write(b'\x89PNG\r\n\x1a\n')
+            pngFile.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+            pngFile.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), compression)))
+            pngFile.write(chunk(b'IEND', b''))
+
+    def toPNG(self, filename, path=None, scale=16):
+        """
+        Save the board's current weights as a PNG file.
+
+        param1: string - file to write
+        param2: Path/[[x,y]] - squares to highlight, or None
+        param3: int - pixels per square along each side
+        """
+        self.writePNG(filename, self.render(path, scale))
+
+    def toAnsi(self, path=None, numbers=False):
+        """
+        Draw the board's current weights with 24-bit terminal colours.
+
+        param1: Path/[[x,y]] - squares to highlight, or None
+        param2: boolean - print each square's weight on it
+        return: string - one line per row of the board
+        """
+        image = self.render(path)
+        weights = self.board.denormalizeWeights(self.board.board).T
+        lines = []
+        for y in range(image.shape[0]):
+            cells = []
+            for x in range(image.shape[1]):
+                text = '%3d' % weights[y, x] if numbers else '  '
+                cells.append('\033[48;2;%d;%d;%dm%s' % (tuple(image[y, x]) + (text,)))
+            lines.append(''.join(cells) + '\033[0m')
+        return '\n'.join(lines)
@@ -2,6 +2,7 @@
 decisions based on a variety of factors in order to produce the optimal next move."""
 
 from enum import Enum
+from app.util.ReachableSpace import ReachableSpace
 
 class StateMachine:
     """The main state machine. Entry point for this file,
@@ -13,6 +14,13 @@ class StateMachine:
     snakes          {UUID:Snake}  - dict of UUIDs to Snake objects 
     us              UUID          - The UUID of our snake
     food            Food          - Food object representing food coordinates
+    space           ReachableSpace - free regions of the board
+    turn            int           - turn the cached measurements belong to
+    availableSpace  int           - squares reachable from our head this turn,
+                                      None until first needed
+    nearestFood     float         - squares on the path from our head to the
+                                      closest food this turn, counting both
+                                      ends, None until first needed
     """
 
     def __init__(self, board, snakes, us, food):
@@ -29,7 +37,11 @@ class StateMachine:
         self.snakes = snakes
         self.us = us
         self.food = food
-        
+        self.space = ReachableSpace(board, snakes)
+        self.turn = None
+        self.availableSpace = None
+        self.nearestFood = None
+
     def getState(self):
         """
         Return the current state.
@@ -46,13 +58,27 @@ class StateMachine:
         """
         self.state = State[stateName]
 
-    def step(self):
+    def startTurn(self, turn=None):
+        """
+        Forget measurements taken on an earlier turn.
+
+        param1: int - current turn, or None to always measure again
+        """
+        if turn is None or turn != self.turn:
+            self.turn = turn
+            self.availableSpace = None
+            self.nearestFood = None
+
+    def step(self, turn=None):
         """
         Use the available information to pick a new state.
+
+        param1: int - current turn, or None if it is not known
         """
         ourSnake = self.snakes[self.us]
         size = ourSnake.getSize()
         health = ourSnake.getHealth()
+        self.startTurn(turn)
 
         currentState = self.getState()
         if currentState is 'IDLE':
@@ -107,22 +133,47 @@ class StateMachine:
         param1: value - value to compare against
         return: boolean - True if 'snake' is closer than 'value'
         """
-        ourSnake = self.snakes[self.us]
-        headPos = ourSnake.getHeadPosition()
-        for pos in self.food.getPositions():
-            distance = self.board.optimumPathLength(pos, headPos)
-            if distance < value:
-                return True
-        return False
+        if self.nearestFood is None:
+            self.nearestFood = self.nearestFoodDistance()
+        return self.nearestFood < value
 
     def availableSpaceLess(self, value):
         """
-        Determine if a snake has health lower than 'value'
+        Determine if our snake can reach fewer than 'value' squares
 
         param1: value - value to compare against
-        return: boolean - True if health less than 'value'
+        return: boolean - True if reachable space less than 'value'
+        """
+        if self.availableSpace is None:
+            self.availableSpace = self.reachableSpace()
+        return self.availableSpace < value
+
+    def nearestFoodDistance(self):
+        """
+        Count the squares on the shortest path from our head to the closest
+        food, with one search from our head to every square. Both ends are
+        counted, like Board.optimumPathLength(), so a food next to our head
+        is 2 and the thresholds in step() keep their meaning.
+
+        return: float - number of squares, inf if no food can be reached
+        """
+        positions = self.food.getPositions()
+        if not positions:
+            return float('inf')
+        headPos = self.snakes[self.us].getHeadPosition()
+        distances = self.board.distanceField(headPos, weighted=False)
+        # the field counts moves, one fewer than the squares on the path
+        return float(min(distances[x, y] for (x, y) in positions)) + 1
+
+    def reachableSpace(self):
+        """
+        Count the squares our snake can reach from its head, including body
+        squares that will have moved away by the time it gets there.
+
+        return: int - number of reachable squares
         """
-        return False
+        self.space.update()
+        return self.space.getEscapableArea(self.snakes[self.us].getHeadPosition())
 
 
 class State(Enum):
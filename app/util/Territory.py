@@ -0,0 +1,133 @@
+"""Splits the board between snakes. Every free square belongs to the snake whose
+head can reach it first, found with one breadth first search from all heads."""
+
+from collections import deque
+import numpy as np
+from app.util.Neighbours import Neighbours
+from app.util.ReachableSpace import ReachableSpace
+
+
+class Territory:
+    """Voronoi partition of the board between snake heads.
+
+    Has following attributes:
+    board           Board           - Board object
+    snakes          {UUID:Snake}    - dict of UUIDs to Snake objects
+    neighbours      Neighbours      - neighbour tables for the board's size
+    space           ReachableSpace  - which squares bodies block
+    order           [UUID]          - snake UUIDs, indexed by owner number
+    owners          np.array        - owner number of each square, UNCLAIMED
+                                        or CONTESTED
+    distances       np.array        - moves from the owning head, inf if unreached
+    """
+
+    # owner numbers of squares nobody reaches, and of squares reached by
+    # several snakes on the same move
+    UNCLAIMED = -1
+    CONTESTED = -2
+
+    def __init__(self, board, snakes):
+        """
+        Initialize the territory.
+
+        param1: Board - board object
+        param2: {UUID:Snake} - dict mapping UUIDs to snakes
+        """
+        self.board = board
+        self.snakes = snakes
+        self.neighbours = Neighbours.forSize(board.width, board.height)
+        self.space = ReachableSpace(board, snakes)
+
+        self.order = []
+        self.owners = np.full((board.width, board.height), self.UNCLAIMED)
+        self.distances = np.full((board.width, board.height), np.inf)
+
+    def update(self):
+        """
+        Recompute who owns each square from the current snake positions.
+        Squares ReachableSpace.getBlocked() marks are never entered. A square reached by several heads on the same move is CONTESTED, and
+        nobody expands through it.
+        """
+        height = self.board.height
+        lists = self.neighbours.getLists()
+        size = self.board.width * height
+
+        self.order = list(self.snakes)
+        owners = [self.UNCLAIMED] * size
+        distances = [-1] * size
+        self.space.update()
+        for node in np.flatnonzero(self.space.getBlocked()).tolist():
+            distances[node] = size  # never entered
+
+        queue = deque()
+        for (owner, snakeId) in enumerate(self.order):
+            (x, y) = self.snakes[snakeId].getHeadPosition()
+            head = x * height + y
+            owners[head] = owner
+            distances[head] = 0
+            queue.append(head)
+
+        while queue:
+            node = queue.popleft()
+            owner = owners[node]
+            if owner == self.CONTESTED:
+                continue
+            distance = distances[node] + 1
+            for neighbour in lists[node]:
+                if distances[neighbour] < 0:
+                    distances[neighbour] = distance
+                    owners[neighbour] = owner
+                    queue.append(neighbour)
+                elif distances[neighbour] == distance and owners[neighbour] != owner:
+                    owners[neighbour] = self.CONTESTED
+
+        self.owners = np.array(owners).reshape(self.board.width, height)
+        reached = np.array(distances, dtype=float)
+        reached[(reached < 0) | (reached == size)] = np.inf
+        self.distances = reached.reshape(self.board.width, height)
+
+    def getOwnership(self):
+        """
+        Return the owner number of each square, an index into getOrder().
+
+        return: np.array - owner numbers shaped like the board
+        """
+        return self.owners
+
+    def getOrder(self):
+        """
+        Return snake UUIDs in owner number order.
+
+        return: [UUID] - snake UUIDs
+        """
+        return self.order
+
+    def getOwner(self, coord):
+        """
+        Return the snake that reaches a square first.
+
+        param1: [x,y] - square to look up
+        return: UUID - owning snake, or None if unclaimed or contested
+        """
+        owner = self.owners[coord[0], coord[1]]
+        if owner < 0:
+            return None
+        return self.order[owner]
+
+    def getCellCounts(self):
+        """
+        Return how many squares each snake owns, not counting its head.
+
+        return: {UUID:int} - dict of UUIDs to owned square counts
+        """
+        owned = self.owners[self.distances > 0]
+        counts = np.bincount(owned[owned >= 0], minlength=len(self.order))
+        return {snakeId: int(counts[owner]) for (owner, snakeId) in enumerate(self.order)}
+
+    def getContested(self):
+        """
+        Return which squares several snakes reach on the same move.
+
+        return: np.array - boolean mask shaped like the board
+        """
+        return self.owners == self.CONTESTED
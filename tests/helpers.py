@@ -0,0 +1,21 @@
+"""
+Shared builders for test objects.
+"""
+
+from app.obj.Snake import Snake
+
+def makeSnake(positions, identifier='snake', health=100):
+    """
+    Return a Snake occupying positions, head first, built from the same data
+    the server sends.
+    """
+    return Snake({
+        'object': 'snake',
+        'id': identifier,
+        'health': health,
+        'length': len(positions),
+        'body': {
+            'object': 'list',
+            'data': [{'object': 'point', 'x': x, 'y': y} for (x, y) in positions],
+        },
+    })
@@ -0,0 +1,67 @@
+"""
+Test the A* point-to-point search.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+
+class TestAStarSearch(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def test_cost_matches_dijkstra(self):
+        """
+        Ensure A* paths cost the same as full Dijkstra searches.
+        """
+        rng = np.random.RandomState(9)
+        board = Board(11, 9)
+        for _ in range(50):
+            coord = [int(rng.randint(11)), int(rng.randint(9))]
+            board.setWeight(coord, int(rng.choice([0, 10, 50, 75, 99, 100])))
+        costs = board.board.ravel()
+
+        for start in [0, 23, 61, 98]:
+            distances = board.shortestPathTree(start)[0]
+            for end in range(0, board.board.size, 5):
+                path = board.getAStarSearch().search(start, end)
+                if path is None:
+                    self.assertTrue(np.isinf(distances[end]))
+                else:
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], end)
+                    self.assertEqual(sum(costs[path[1:]]), distances[end])
+
+    def test_optimum_path_astar(self):
+        """
+        Ensure optimumPath can answer with A* without filling the path cache.
+        """
+        board = Board(5, 5)
+        coords = [[0, 1], [0, 2], [0, 3], [0, 4], [1, 4], [2, 4], [2, 3], [2, 2], [2, 1]]
+        board.setWeights(coords, 60)
+        self.assertEqual(board.optimumPath([0, 0], [2, 0], astar=True), \
+            [[0, 0], [1, 0], [2, 0]])
+        self.assertEqual(len(board.pathCache), 0)
+
+    def test_unreachable(self):
+        """
+        Ensure A* reports a walled off target as unreachable.
+        """
+        board = Board(5, 5)
+        board.setWeights([[0, 1], [1, 0], [1, 1]], 0)
+        self.assertEqual(board.optimumPath([2, 0], [0, 0], astar=True), None)
+
+    def test_min_cost(self):
+        """
+        Ensure the heuristic scale follows the cheapest non-wall node.
+        """
+        board = Board(5, 5)
+        self.assertEqual(board.getMinCost(), 50)
+        board.setWeight([3, 3], 80)
+        board.setWeight([1, 1], 0)
+        self.assertEqual(board.getMinCost(), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Test the Board class.
 """
 #!/usr/bin/python3
 import unittest
+import numpy as np
 from app.Board import Board
 
 class TestBoard(unittest.TestCase):
@@ -38,6 +39,39 @@ class TestBoard(unittest.TestCase):
         with self.assertRaises(ValueError):
             Board(width, height)
 
+    def test_init_invalid_engine(self):
+        """
+        Tests initilising board with an unknown path engine.
+        """
+        with self.assertRaises(ValueError):
+            Board(20, 20, engine='igraph')
+
+    def test_init_not_strict(self):
+        """
+        Tests a board built without argument checks skips per-call checks but
+        still bounds checks bulk nodes.
+        """
+        bd = Board(20, 20, strict=False)
+        self.assertFalse(bd.strict)
+        bd.setWeight([3, 4], 80)
+        # numpy integers fail checkInt, but are fine to index with
+        self.assertEqual(bd.getNodeWithPriority(np.int64(0)), [3, 4])
+        self.assertRaises(ValueError, Board(20, 20).getNodeWithPriority, np.int64(0))
+        with self.assertRaises(ValueError):
+            bd.setWeights([[0, 0], [20, 0]], 10)
+
+    def test_init_strict_default(self):
+        """
+        Tests boards follow the global strict mode unless told otherwise.
+        """
+        self.assertTrue(Board(20, 20).strict)
+        Board.STRICT = False
+        try:
+            self.assertFalse(Board(20, 20).strict)
+            self.assertTrue(Board(20, 20, strict=True).strict)
+        finally:
+            Board.STRICT = True
+
     def test_init_weighting(self):
         """
         Tests the Board init function initial weighting.
@@ -320,6 +354,22 @@ class TestBoard(unittest.TestCase):
                 desiredWeight = 0
             self.assertAlmostEqual(bd.getWeight(coord), desiredWeight, places=4)
 
+    def test_divide_many_weights_by_zero(self):
+        """
+        Tests dividing many nodes weights by zero leaves the board untouched.
+        """
+        bd = Board(30, 30)
+        coords = [[15, 15], [2, 7]]
+        bd.setWeights(coords, 0)
+        bd.setWeight([9, 25], 40)
+        before = bd.board.copy()
+
+        self.assertRaises(ZeroDivisionError, bd.modifyWeights, '/', coords + [[9, 25]], 0)
+        self.assertRaises(ZeroDivisionError, bd.applyWeights, '/', [[9, 25]], np.array([0]))
+        self.assertRaises(ValueError, bd.applyWeights, np.multiply, [[9, 25]], np.inf)
+        self.assertTrue(np.array_equal(bd.board, before))
+        self.assertFalse(np.isnan(bd.board).any())
+
     def test_add_many_nodes(self):
         """
         Tests adding to many nodes weights.
@@ -342,6 +392,23 @@ class TestBoard(unittest.TestCase):
                 desiredWeight = addend
             self.assertEqual(bd.getWeight(coord), desiredWeight)
 
+    def test_modify_nodes_listed_twice(self):
+        """
+        Tests a node listed more than once is changed once per listing, with
+        the same rounding as changing it one call at a time.
+        """
+        nodes = [[1, 1], [2, 2], [1, 1], [3, 3], [1, 1]]
+        for (operator, value) in [('+', 30), ('-', 7), ('*', 1.5), ('/', 2)]:
+            bulk = Board(5, 5)
+            single = Board(5, 5)
+            for board in (bulk, single):
+                board.setWeight([1, 1], 33)
+            bulk.modifyWeights(operator, nodes, value)
+            for node in nodes:
+                {'+': single.addWeight, '-': single.subtractWeight,
+                 '*': single.multiplyWeight, '/': single.divideWeight}[operator](node, value)
+            self.assertTrue(np.array_equal(bulk.board, single.board))
+
     def test_subtract_many_nodes(self):
         """
         Tests subtracting from many nodes weights.
@@ -364,6 +431,52 @@ class TestBoard(unittest.TestCase):
                 desiredWeight = 0
             self.assertEqual(bd.getWeight(coord), desiredWeight)
 
+    def test_apply_weights_mask(self):
+        """
+        Tests modifying weights selected by a boolean mask.
+        """
+        bd = Board(6, 4)
+        mask = np.zeros((6, 4), dtype=bool)
+        mask[1:3, 2:] = True
+        bd.applyWeights('+', mask, 30)
+        weights = bd.getWeights(np.ones((6, 4), dtype=bool)).reshape(6, 4)
+        self.assertTrue((weights[mask] == 80).all())
+        self.assertTrue((weights[~mask] == 50).all())
+
+    def test_apply_weights_ufunc(self):
+        """
+        Tests modifying weights of a coordinate array with a numpy ufunc and
+        one value per node.
+        """
+        bd = Board(10, 10)
+        coords = np.array([[1, 2], [3, 4], [5, 6]])
+        bd.applyWeights(np.maximum, coords, np.array([20, 70, 120]))
+        self.assertEqual(bd.getWeights(coords).tolist(), [50, 70, 100])
+
+    def test_apply_weights_invalid_nodes(self):
+        """
+        Tests bulk operations reject bad nodes and masks.
+        """
+        bd = Board(10, 10)
+        with self.assertRaises(ValueError):
+            bd.applyWeights('+', [[0, 0], [10, 3]], 5)
+        with self.assertRaises(ValueError):
+            bd.applyWeights('+', [[0, 0], [-1, 3]], 5)
+        with self.assertRaises(ValueError):
+            bd.applyWeights('+', [[0.5, 0]], 5)
+        with self.assertRaises(ValueError):
+            bd.applyWeights('+', np.ones((10, 9), dtype=bool), 5)
+        with self.assertRaises(ValueError):
+            bd.applyWeights('^', [[0, 0]], 5)
+
+    def test_apply_weights_no_nodes(self):
+        """
+        Tests an empty list of nodes changes nothing.
+        """
+        bd = Board(10, 10)
+        bd.modifyWeights('+', [], 5)
+        self.assertEqual(bd.getWeight([0, 0]), 50)
+
     def test_modify_weights_invalid_operator(self):
         """
         Tests modifyWeightsErorrCheck with an invalid operator.
@@ -399,6 +512,30 @@ class TestBoard(unittest.TestCase):
         # Returns lowest priority first
         self.assertEqual(bd.getNodesWithPriority(0, 4), coords[::-1])
 
+    def test_get_priority_nodes_rectangular(self):
+        """
+        Tests priority lookups decode nodes correctly on a board that is not square.
+        """
+        bd = Board(4, 9)
+        coords = [[3, 8], [0, 7], [2, 1], [3, 0]]
+        weights = [90, 80, 70, 60]
+        for coord, weight in zip(coords, weights):
+            bd.setWeight(coord, weight)
+        self.assertEqual(bd.getNodeWithPriority(0), coords[0])
+        self.assertEqual(bd.getNodesWithPriority(0, 3), coords)
+
+    def test_priority_order_cached(self):
+        """
+        Tests the priority index is only rebuilt after weights change.
+        """
+        bd = Board(10, 10)
+        order = bd.getPriorityOrder()
+        bd.getNodesWithPriority(0, 5)
+        self.assertIs(bd.getPriorityOrder(), order)
+        bd.setWeight([4, 4], 99)
+        self.assertIsNot(bd.getPriorityOrder(), order)
+        self.assertEqual(bd.getNodeWithPriority(0), [4, 4])
+
     def test_priority_node_error_check(self):
         """
         Tests invalid nodes in getNodesWithPriorityErrorCheck
@@ -477,6 +614,16 @@ class TestBoard(unittest.TestCase):
             bd.setWeight(coord, weight)
         self.assertEqual(bd.countNodeWeightCopies(coords[0]), len(coords))
 
+    def test_count_wall_copies(self):
+        """
+        Tests counting walls, which are stored as infinite weights.
+        """
+        bd = Board(10, 10)
+        coords = [[1, 1], [2, 2], [3, 3]]
+        bd.setWeights(coords, 0)
+        self.assertEqual(bd.countNodeWeightCopies(coords[0]), len(coords))
+        self.assertEqual(bd.countNodeWeightCopies([0, 0]), 100 - len(coords))
+
     def test_optimum_path_by_weight(self):
         """
         Tests a board which has no optimal path by length, but does by weight.
@@ -564,6 +711,230 @@ class TestBoard(unittest.TestCase):
         path_length = bd.optimumPathLength(start, end)
         self.assertEqual(path_length, (len(ideal_path)))
 
+    def test_searches_built_on_first_use(self):
+        """
+        Tests the pure Python searches are only built once they are needed.
+        """
+        bd = Board(5, 5)
+        bd.optimumPath([0, 0], [4, 4])
+        self.assertIsNone(bd.bucketSearch)
+        self.assertIsNone(bd.aStarSearch)
+        bd.optimumPath([4, 0], [0, 4], astar=True)
+        self.assertIs(bd.aStarSearch, bd.getAStarSearch())
+        self.assertIsNone(bd.bucketSearch)
+
+    def test_optimum_path_rectangular(self):
+        """
+        Tests a path on a board that is not square.
+        """
+        bd = Board(6, 3)
+        wall = [[2, 0], [2, 1]]
+        bd.setWeights(wall, 0)
+        path = bd.optimumPath([0, 0], [5, 0])
+
+        self.assertEqual(path[0], [0, 0])
+        self.assertEqual(path[-1], [5, 0])
+        self.assertIn([2, 2], path)
+        for coord in wall:
+            self.assertNotIn(coord, path)
+
+    def test_optimum_path_after_set_weight(self):
+        """
+        Tests a path query sees a weight set after the previous query.
+        """
+        bd = Board(5, 5)
+        self.assertIn([1, 0], bd.optimumPath([0, 0], [2, 0]))
+        bd.setWeight([1, 0], 0)
+        self.assertNotIn([1, 0], bd.optimumPath([0, 0], [2, 0]))
+
+    def test_adjacency_patch_matches_rebuild(self):
+        """
+        Tests patching only dirty nodes gives the same edges as a full rebuild.
+        """
+        bd = Board(9, 6)
+        bd.optimumPath([0, 0], [1, 1])
+        coords = [[0, 0], [8, 5], [4, 3], [2, 5], [8, 0]]
+        weights = [0, 100, 20, 75, 33]
+        for coord, weight in zip(coords, weights):
+            bd.setWeight(coord, weight)
+        self.assertEqual(len(bd.dirtyNodes), len(coords))
+
+        bd.updateAdjMatrix()
+        patched = bd.adjMatrix.data.copy()
+        bd.allNodesDirty = True
+        bd.updateAdjMatrix()
+        self.assertTrue((patched == bd.adjMatrix.data).all())
+        self.assertEqual(bd.dirtyNodes, set())
+
+    def test_path_cache_reused(self):
+        """
+        Tests repeated queries from one start reuse the cached search.
+        """
+        bd = Board(10, 10)
+        tree = bd.shortestPathTree(0)
+        self.assertIs(bd.shortestPathTree(0), tree)
+        bd.optimumPath([0, 0], [9, 9])
+        self.assertEqual(len(bd.pathCache), 1)
+
+    def test_path_cache_invalidated(self):
+        """
+        Tests the path cache is dropped when weights change.
+        """
+        bd = Board(10, 10)
+        tree = bd.shortestPathTree(0)
+        bd.setWeight([5, 5], 90)
+        self.assertIsNot(bd.shortestPathTree(0), tree)
+        self.assertEqual(len(bd.pathCache), 1)
+
+    def test_path_cache_bounded(self):
+        """
+        Tests the path cache never holds more than PATH_CACHE_SIZE searches.
+        """
+        bd = Board(10, 10)
+        for start in range(bd.PATH_CACHE_SIZE + 5):
+            bd.shortestPathTree(start)
+        self.assertEqual(len(bd.pathCache), bd.PATH_CACHE_SIZE)
+        self.assertNotIn(0, bd.pathCache)
+
+    def test_average_weights_uniform(self):
+        """
+        Tests diffusing a uniform board leaves it unchanged.
+        """
+        bd = Board(8, 6)
+        bd.averageWeights(20)
+        self.assertTrue((bd.getWeights(np.ones((8, 6), dtype=bool)) == 50).all())
+
+    def test_average_weights_sources(self):
+        """
+        Tests walls and sources keep their weight while heat spreads from them.
+        """
+        bd = Board(9, 9)
+        bd.setWeight([0, 0], 0)
+        bd.setWeight([6, 6], 100)
+        bd.averageWeights(5, sources=[[6, 6]])
+
+        self.assertEqual(bd.getWeight([0, 0]), 0)
+        self.assertEqual(bd.getWeight([6, 6]), 100)
+        self.assertLess(bd.getWeight([1, 0]), 50)
+        self.assertGreater(bd.getWeight([6, 5]), bd.getWeight([6, 3]))
+        self.assertGreater(bd.getWeight([6, 3]), 50)
+
+    def test_average_weights_free_walls(self):
+        """
+        Tests walls can be allowed to warm up.
+        """
+        bd = Board(5, 5)
+        bd.setWeight([2, 2], 0)
+        bd.averageWeights(1, fixWalls=False)
+        self.assertEqual(bd.getWeight([2, 2]), 40)
+
+    def test_reset_weights_in_place(self):
+        """
+        Tests resetting reuses the weight array and only dirties changed nodes.
+        """
+        bd = Board(10, 10)
+        weights = bd.board
+        bd.optimumPath([0, 0], [9, 9])
+        bd.setWeight([4, 4], 90)
+        bd.resetWeights()
+        self.assertIs(bd.board, weights)
+        self.assertEqual(bd.getWeight([4, 4]), 50)
+        self.assertEqual(bd.dirtyNodes, {4 * 10 + 4})
+
+        version = bd.weightVersion
+        bd.resetWeights()
+        self.assertEqual(bd.weightVersion, version)
+
+    def test_snapshot_restore(self):
+        """
+        Tests restoring a snapshot brings back weights and cached paths.
+        """
+        bd = Board(8, 8)
+        bd.setWeight([3, 3], 80)
+        path = bd.optimumPath([0, 0], [7, 7])
+        saved = bd.snapshot()
+        tree = bd.shortestPathTree(0)
+
+        bd.setWeights([[1, 0], [0, 1]], 0)
+        self.assertEqual(bd.optimumPath([0, 0], [7, 7]), None)
+        bd.restore(saved)
+
+        self.assertEqual(bd.getWeight([1, 0]), 50)
+        self.assertEqual(bd.getWeight([3, 3]), 80)
+        self.assertIs(bd.shortestPathTree(0), tree)
+        self.assertEqual(bd.optimumPath([0, 0], [7, 7]), path)
+
+    def test_restore_never_reuses_versions(self):
+        """
+        Tests caches from an abandoned branch are not mistaken for new weights.
+        """
+        bd = Board(8, 8)
+        saved = bd.snapshot()
+        bd.setWeight([1, 0], 0)
+        bd.getPriorityOrder()
+        bd.restore(saved)
+        bd.setWeight([1, 0], 100)
+        self.assertEqual(bd.getNodeWithPriority(0), [1, 0])
+
+    def test_distance_field_weighted(self):
+        """
+        Tests weighted distances match the cost of optimum paths.
+        """
+        bd = Board(6, 4)
+        bd.setWeights([[1, 0], [1, 1], [1, 2]], 0)
+        bd.setWeight([4, 3], 80)
+        field = bd.distanceField([0, 0])
+        self.assertEqual(field.shape, (6, 4))
+        self.assertEqual(field[0, 0], 0)
+        self.assertEqual(field[0, 3], 150)
+        self.assertEqual(field[4, 3], 50 * 6 + 20)
+        self.assertTrue(np.isinf(field[1, 1]))
+
+    def test_distance_field_unweighted(self):
+        """
+        Tests unweighted distances count moves around walls.
+        """
+        bd = Board(5, 5)
+        bd.setWeights([[1, 0], [1, 1], [1, 2], [1, 3]], 0)
+        bd.setWeight([0, 0], 0)  # sources count even when they are walls
+        field = bd.distanceField([0, 0], weighted=False)
+        self.assertEqual(field[0, 0], 0)
+        self.assertEqual(field[0, 4], 4)
+        self.assertEqual(field[2, 0], 10)
+        self.assertTrue(np.isinf(field[1, 2]))
+
+    def test_distance_field_many_sources(self):
+        """
+        Tests distances are from the nearest of several sources.
+        """
+        bd = Board(7, 2)
+        sources = [[0, 0], [6, 1]]
+        for weighted in (True, False):
+            field = bd.distanceField(sources, weighted)
+            self.assertEqual(field[0, 0], 0)
+            self.assertEqual(field[6, 1], 0)
+            self.assertEqual(field[3, 0], 3 * (50 if weighted else 1))
+            self.assertEqual(field[5, 0], 2 * (50 if weighted else 1))
+
+    def test_tuples_of_points(self):
+        """
+        Tests tuples of points are read as points, like lists, and only a
+        pair of numpy arrays is read as x and y coordinates.
+        """
+        bd = Board(7, 2)
+        field = bd.distanceField(((0, 0), (6, 1)), weighted=False)
+        self.assertEqual(field[0, 0], 0)
+        self.assertEqual(field[6, 1], 0)
+        self.assertEqual(field[3, 0], 3)
+        self.assertEqual(bd.distanceField((6, 0), weighted=False)[0, 0], 6)
+
+        bd.setWeights(((0, 1), (2, 1)), 80)
+        self.assertEqual(bd.getWeight([0, 1]), 80)
+        self.assertEqual(bd.getWeight([2, 1]), 80)
+        self.assertEqual(bd.getWeight([1, 0]), 50)
+        arrays = (np.array([0, 2]), np.array([1, 1]))
+        self.assertTrue(np.array_equal(bd.getWeights(arrays), [80, 80]))
+
 
 if __name__ == "__main__":
     unittest.main()
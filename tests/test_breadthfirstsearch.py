@@ -0,0 +1,38 @@
+"""
+Test the unweighted breadth first search.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+
+class TestBreadthFirstSearch(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def test_matches_unit_weights(self):
+        """
+        Ensure moves agree with weighted distances on a board of equal weights.
+        """
+        board = Board(9, 6)
+        board.setWeights([[4, y] for y in range(5)], 0)
+        sources = (np.array([0, 8]), np.array([0, 5]))
+        moves = board.breadthFirstSearch.distanceField(*sources)
+        weighted = board.distanceField(sources) / 50
+        self.assertTrue(np.array_equal(moves, weighted))
+
+    def test_searches_do_not_share_results(self):
+        """
+        Ensure a second search is not affected by the buffers of the first.
+        """
+        board = Board(4, 4)
+        search = board.breadthFirstSearch
+        first = search.distanceField(np.array([0]), np.array([0]))
+        search.distanceField(np.array([3]), np.array([3]))
+        self.assertEqual(first[3, 3], 6)
+        self.assertEqual(search.distanceField(np.array([3]), np.array([3]))[0, 0], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Test the bucket queue shortest path engine.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+from app.util.BucketSearch import BucketSearch
+
+class TestBucketSearch(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def test_matches_scipy(self):
+        """
+        Ensure distances agree with scipy on a randomly weighted board.
+        """
+        rng = np.random.RandomState(4)
+        scipyBoard = Board(13, 8)
+        bucketBoard = Board(13, 8, engine='bucket')
+        for _ in range(60):
+            coord = [int(rng.randint(13)), int(rng.randint(8))]
+            weight = int(rng.choice([0, 20, 50, 99, 100, 110]))
+            scipyBoard.setWeight(coord, weight)
+            bucketBoard.setWeight(coord, weight)
+
+        for start in [0, 17, 50, 103]:
+            expected = scipyBoard.shortestPathTree(start)[0]
+            actual = bucketBoard.shortestPathTree(start)[0]
+            self.assertTrue(np.array_equal(expected, actual))
+
+    def test_zero_cost_nodes(self):
+        """
+        Ensure fully weighted nodes are free to walk through.
+        """
+        board = Board(5, 5, engine='bucket')
+        board.setWeights([[1, 0], [2, 0], [3, 0]], 100)
+        distances, previous = board.getBucketSearch().shortestPathTree(0)
+        self.assertEqual(distances[3 * 5], 0)
+        self.assertEqual(previous[3 * 5], 2 * 5)
+        self.assertEqual(board.optimumPath([0, 0], [4, 0]), \
+            [[0, 0], [1, 0], [2, 0], [3, 0], [4, 0]])
+
+    def test_unreachable(self):
+        """
+        Ensure walled off nodes have no distance or predecessor.
+        """
+        board = Board(5, 5, engine='bucket')
+        board.setWeights([[0, 1], [1, 0], [1, 1]], 0)
+        distances, previous = board.getBucketSearch().shortestPathTree(0)
+        self.assertTrue(np.isinf(distances[4 * 5 + 4]))
+        self.assertEqual(previous[4 * 5 + 4], BucketSearch.NO_PREDECESSOR)
+        self.assertEqual(board.optimumPath([2, 0], [0, 0]), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Test union and find operations.
 """
 
 import unittest
+import numpy as np
 from unittest.mock import Mock
 from app.util.DisjointSet import DisjointSet
 from app.Board import Board
@@ -16,7 +17,8 @@ class TestDisjointSet(unittest.TestCase):
         """
         Create a fresh DisjointSet object.
         """
-        self.board = Mock(width=20, height=20)
+        self.board = Board(20, 20)
+        self.everywhere = np.ones((20, 20), dtype=bool)
         self.set = DisjointSet(self.board)
         self.set.update()
         
@@ -36,17 +38,17 @@ class TestDisjointSet(unittest.TestCase):
         """
         Ensure basic update is performed properly.
         """
-        self.board.getWeight.return_value = 0
+        self.board.setWeights(self.everywhere, 0)
         self.set.update()
         for x in range(self.board.width):
             for y in range(self.board.height):
-                self.assertEqual(self.set.getConnectedToWall([x, y]), [])
+                self.assertEqual(self.set.getConnectedToWall([x, y]), 0)
 
     def test_error_conditions(self):
         """
         Ensure basic update is performed properly.
         """
-        self.board.getWeight.return_value = 0
+        self.board.setWeights(self.everywhere, 0)
         self.set.update()
         for x in range(self.board.width):
             for y in range(self.board.height):
@@ -54,7 +56,7 @@ class TestDisjointSet(unittest.TestCase):
                 if [x, y] != [0, 0]:
                     self.assertRaises(ValueError, self.set.pathExistsFromNode, [x, y], [0, 0])
 
-        self.board.getWeight.return_value = 100
+        self.board.setWeights(self.everywhere, 100)
         self.set.update()
         for x in range(self.board.width):
             for y in range(self.board.height):
@@ -141,6 +143,148 @@ class TestDisjointSet(unittest.TestCase):
         for coord in wall:
             self.assertTrue(dset.pathExistsFromWall(coord, [0, 0]))
 
+    def test_sizes_and_roots(self):
+        """
+        Ensure every square of a component shares one root holding its size.
+        """
+        board = Board(10, 10)
+        dset = DisjointSet(board)
+        wall = [[0, 1], [1, 2], [2, 2], [3, 2], [3, 1], [4, 0]]
+        board.setWeights(wall, 0)
+        dset.update()
+
+        inside = dset.find(dset.getNode([0, 0]))
+        outside = dset.find(dset.getNode([9, 9]))
+        self.assertNotEqual(inside, outside)
+        self.assertEqual(dset.size[inside], 6)
+        self.assertEqual(dset.size[outside], 100 - 6 - len(wall))
+        self.assertIsNone(dset.find(dset.getNode([4, 0])))
+        self.assertEqual(dset.parent[dset.getNode([4, 0])], DisjointSet.WALL)
+
+    def test_component_queries(self):
+        """
+        Ensure component ids, sizes and labels agree with each other.
+        """
+        board = Board(10, 10)
+        dset = DisjointSet(board)
+        wall = [[0, 1], [1, 2], [2, 2], [3, 2], [3, 1], [4, 0]]
+        board.setWeights(wall, 0)
+        dset.update()
+
+        self.assertEqual(dset.getComponentSize([1, 1]), 6)
+        self.assertEqual(dset.getComponentSize([9, 9]), 88)
+        self.assertEqual(dset.getComponentSize([4, 0]), 0)
+        self.assertIsNone(dset.getComponentId([4, 0]))
+
+        labels = dset.getLabels()
+        self.assertEqual(labels.shape, (10, 10))
+        self.assertEqual(int((labels == dset.getComponentId([0, 0])).sum()), 6)
+        self.assertEqual(int((labels == DisjointSet.WALL).sum()), len(wall))
+
+        # [3, 1] touches both sides, [3, 2] only the outside
+        self.assertEqual(dset.getConnectedToWall([3, 1]), 6 + 88)
+        self.assertEqual(dset.getConnectedToWall([3, 2]), 88)
+        self.assertEqual(dset.getAreaByDirection([3, 1]),
+                         {'left': 6, 'right': 88, 'down': 0, 'up': 6})
+
+    def test_update_cells_split_and_merge(self):
+        """
+        Ensure blocking a gap splits a component, and freeing it joins them again.
+        """
+        board = Board(10, 10)
+        dset = DisjointSet(board)
+        wall = [[0, 1], [1, 2], [2, 2], [3, 2], [3, 1]]
+        board.setWeights(wall, 0)
+        dset.update()
+        self.assertTrue(dset.pathExistsFromNode([0, 0], [9, 9]))
+
+        dset.updateCells([], [[4, 0]])
+        self.assertFalse(dset.pathExistsFromNode([0, 0], [9, 9]))
+        self.assertEqual(dset.getComponentSize([0, 0]), 6)
+        self.assertEqual(dset.getComponentSize([9, 9]), 88)
+        self.assertEqual(dset.getConnectedToWall([4, 0]), 94)
+
+        dset.updateCells([[4, 0], [0, 1]], [])
+        self.assertTrue(dset.pathExistsFromNode([0, 0], [9, 9]))
+        self.assertEqual(dset.getComponentSize([0, 0]), 96)
+
+    def test_update_cells_matches_update(self):
+        """
+        Ensure a moving snake gives the same components as a full rebuild.
+        """
+        board = Board(8, 8)
+        dset = DisjointSet(board)
+        snake = [[3, y] for y in range(7, -1, -1)]  # wall from top to bottom
+        board.setWeights(snake, 0)
+        dset.update()
+        self.assertEqual(dset.getComponentSize([0, 0]), 24)
+
+        for head in [[4, 0], [5, 0], [5, 1], [5, 2], [4, 2]]:
+            tail = snake.pop()
+            snake.insert(0, head)
+            board.setWeight(tail, 50)
+            board.setWeight(head, 0)
+            dset.updateCells([tail], [head])
+
+            rebuilt = DisjointSet(board)
+            rebuilt.update()
+            for x in range(board.width):
+                for y in range(board.height):
+                    self.assertEqual(dset.getComponentSize([x, y]), rebuilt.getComponentSize([x, y]))
+                    if [x, y] not in snake:
+                        self.assertEqual(dset.pathExistsFromNode([0, 0], [x, y]),
+                                         rebuilt.pathExistsFromNode([0, 0], [x, y]))
+
+    def test_label_backend_matches_union_find(self):
+        """
+        Ensure both update() backends find the same components and sizes.
+        """
+        rng = np.random.RandomState(7)
+        board = Board(12, 9)
+        board.setWeights(rng.rand(12, 9) < 0.4, 0)
+        board.setWeight([5, 5], 0)
+
+        unionFind = DisjointSet(board, backend='unionfind')
+        unionFind.update()
+        labelled = DisjointSet(board)
+        labelled.update()
+        self.assertIsNone(labelled.getComponentId([5, 5]))
+        for x in range(board.width):
+            for y in range(board.height):
+                self.assertEqual(labelled.getComponentSize([x, y]),
+                                 unionFind.getComponentSize([x, y]))
+                if labelled.getComponentId([x, y]) is not None:
+                    self.assertEqual(sorted(labelled.getConnectedToNode([x, y])),
+                                     sorted(unionFind.getConnectedToNode([x, y])))
+
+        # incremental updates carry on from a labelled board
+        board.setWeight([5, 5], 50)
+        labelled.updateCells([[5, 5]], [])
+        unionFind.update()
+        self.assertEqual(labelled.getComponentSize([5, 5]), unionFind.getComponentSize([5, 5]))
+        self.assertRaises(ValueError, DisjointSet, board, 'magic')
+
+    def test_update_from_mask(self):
+        """
+        Ensure components can come from a mask instead of the board weights.
+        """
+        free = np.ones((20, 20), dtype=bool)
+        free[5, :] = False
+        self.set.updateFromMask(free)
+        self.assertIsNone(self.set.getComponentId([5, 3]))
+        self.assertEqual(self.set.getComponentSize([0, 0]), 5 * 20)
+        self.assertEqual(self.set.getComponentSize([19, 19]), 14 * 20)
+        self.assertEqual(self.set.getConnectedToWall([5, 3]), 19 * 20)
+
+    def test_find_halves_path(self):
+        """
+        Ensure find points every other square on its path at its grandparent.
+        """
+        dset = DisjointSet(Mock(width=1, height=5))
+        dset.parent = [0, 0, 1, 2, 3]
+        self.assertEqual(dset.find(4), 0)
+        self.assertEqual(dset.parent, [0, 0, 0, 2, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
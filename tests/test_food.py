@@ -20,7 +20,7 @@ class TestSnake(unittest.TestCase):
         """
         Test the Food init function.
         """
-        self.assertEqual(self.food.getPositions(), [[]])
+        self.assertEqual(self.food.getPositions(), [])
         world = {
             'object': 'world',
             'food': {
@@ -45,7 +45,7 @@ class TestSnake(unittest.TestCase):
         self.assertEqual(self.food.getPositions(), world['food']['data'])
 
         self.food = Food([[]])
-        self.assertEqual(self.food.getPositions(), [[]])
+        self.assertEqual(self.food.getPositions(), [])
 
     def test_update(self):
         """
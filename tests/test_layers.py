@@ -0,0 +1,96 @@
+"""
+Test composing named weight layers into a board.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+
+class TestLayers(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def test_compose_in_order(self):
+        """
+        Tests layers combine in order, and NaN leaves lower layers alone.
+        """
+        bd = Board(5, 5)
+        snakes = np.full((5, 5), np.nan)
+        snakes[0, 0] = 0
+        food = np.full((5, 5), np.nan)
+        food[2, 2] = 100
+        bonus = np.full((5, 5), np.nan)
+        bonus[1:4, 1:4] = 12
+
+        bd.layers.set('snakes', snakes)
+        bd.layers.set('food', food)
+        bd.layers.set('smallSnakes', bonus)
+        bd.layers.compose()
+
+        self.assertEqual(bd.getWeight([0, 0]), 0)
+        self.assertEqual(bd.getWeight([2, 2]), 100)
+        self.assertEqual(bd.getWeight([1, 1]), 62)
+        self.assertEqual(bd.getWeight([4, 4]), 50)
+
+    def test_compose_writes_changes_only(self):
+        """
+        Tests composing only marks nodes whose weight changed as dirty.
+        """
+        bd = Board(6, 6)
+        bd.layers.compose()
+        bd.updateAdjMatrix()
+        food = np.full((6, 6), np.nan)
+        food[3, 4] = 90
+        bd.layers.set('food', food)
+        bd.layers.compose()
+        self.assertEqual(bd.dirtyNodes, {3 * 6 + 4})
+
+        version = bd.weightVersion
+        bd.layers.compose()
+        self.assertEqual(bd.weightVersion, version)
+
+    def test_compose_replaces_direct_writes(self):
+        """
+        Tests the layers own the board, so direct writes do not survive a composition.
+        """
+        bd = Board(5, 5)
+        bd.layers.compose()
+        bd.setWeight([1, 1], 0)
+        bd.layers.compose()
+        self.assertEqual(bd.getWeight([1, 1]), 50)
+
+    def test_update_reuses_unchanged(self):
+        """
+        Tests a layer is only rebuilt when its inputs change.
+        """
+        bd = Board(5, 5)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return np.full((5, 5), 70.0)
+
+        self.assertTrue(bd.layers.update('food', ((1, 1),), build))
+        self.assertFalse(bd.layers.update('food', ((1, 1),), build))
+        self.assertTrue(bd.layers.update('food', ((2, 1),), build))
+        self.assertEqual(len(builds), 2)
+
+    def test_order_configurable(self):
+        """
+        Tests choosing layers and their combination modes.
+        """
+        bd = Board(5, 5)
+        bd.layers.setOrder([('danger', 'min'), ('bonus', 'multiply')])
+        bd.layers.set('danger', np.full((5, 5), 30.0))
+        bd.layers.set('bonus', np.full((5, 5), 2.0))
+        bd.layers.compose()
+        self.assertEqual(bd.getWeight([3, 3]), 60)
+        with self.assertRaises(ValueError):
+            bd.layers.set('food', np.zeros((5, 5)))
+        with self.assertRaises(ValueError):
+            bd.layers.setOrder([('danger', 'xor')])
+
+
+if __name__ == "__main__":
+    unittest.main()
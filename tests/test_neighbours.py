@@ -0,0 +1,73 @@
+"""
+Test the precomputed neighbour tables.
+"""
+
+import unittest
+import numpy as np
+from app.util.Neighbours import Neighbours
+
+class TestNeighbours(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def setUp(self):
+        """
+        Create neighbour tables for a small non-square board.
+        """
+        self.neighbours = Neighbours.forSize(4, 3)
+
+    def test_shared_between_sizes(self):
+        """
+        Ensure boards of the same size share one set of tables.
+        """
+        self.assertIs(Neighbours.forSize(4, 3), self.neighbours)
+        self.assertIsNot(Neighbours.forSize(3, 4), self.neighbours)
+
+    def test_get_neighbours(self):
+        """
+        Ensure only squares on the board are returned, in DIRECTIONS order.
+        """
+        self.assertEqual(self.neighbours.getNeighbours([0, 0]), [[1, 0], [0, 1]])
+        self.assertEqual(self.neighbours.getNeighbours([3, 2]), [[2, 2], [3, 1]])
+        self.assertEqual(self.neighbours.getNeighbours([1, 1]),
+                         [[0, 1], [2, 1], [1, 2], [1, 0]])
+        # callers may modify what they get back
+        self.neighbours.getNeighbours([1, 1]).pop()
+        self.assertEqual(len(self.neighbours.getNeighbours([1, 1])), 4)
+
+    def test_get_directions(self):
+        """
+        Ensure direction labels match the squares they move to.
+        """
+        self.assertEqual(self.neighbours.getDirections([0, 2]), {'right': [1, 2], 'up': [0, 1]})
+
+    def test_table_and_degree(self):
+        """
+        Ensure the padded table agrees with the degree of every node.
+        """
+        table = self.neighbours.getTable()
+        self.assertEqual(table.shape, (12, 4))
+        self.assertEqual(list(table[0]), [Neighbours.PADDING, 3, 1, Neighbours.PADDING])
+        degree = self.neighbours.getDegree()
+        self.assertTrue(np.array_equal(degree, (table != Neighbours.PADDING).sum(axis=1)))
+        self.assertEqual(int(degree.sum()), 2 * (3 * 3 + 4 * 2))
+
+    def test_graph_edges(self):
+        """
+        Ensure the grid graph has one edge per neighbour pair in each direction.
+        """
+        (width, height) = (7, 4)
+        (indptr, indices, incoming) = Neighbours.forSize(width, height).getGraph()
+        self.assertEqual(len(indptr), width * height + 1)
+        self.assertEqual(len(indices), 2 * ((width - 1) * height + width * (height - 1)))
+        # corner [0, 0] connects to [1, 0] and [0, 1]
+        self.assertEqual(sorted(indices[indptr[0]:indptr[1]]), [1, height])
+        # every incoming edge of a node points at that node
+        for node in range(width * height):
+            edges = incoming[node][incoming[node] != Neighbours.PADDING]
+            self.assertTrue(all(indices[edges] == node))
+
+
+if __name__ == "__main__":
+    unittest.main()
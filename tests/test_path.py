@@ -0,0 +1,67 @@
+"""
+Test the Path module & all its components.
+"""
+#!/usr/bin/python
+import unittest
+import numpy as np
+from app.obj.Path import Path
+
+class TestPath(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def setUp(self):
+        """
+        Create a fresh Path object on a board of height 5.
+        """
+        # [0, 2] -> [0, 3] -> [1, 3] -> [2, 3]
+        self.path = Path([2, 3, 8, 13], 5)
+
+    def test_length(self):
+        """
+        Test the path length counts start and end.
+        """
+        self.assertEqual(self.path.getLength(), 4)
+        self.assertEqual(len(self.path), 4)
+
+    def test_first_step(self):
+        """
+        Test the first move off the start node.
+        """
+        self.assertEqual(self.path.getFirstStep(), [0, 3])
+        self.assertEqual(self.path[1], [0, 3])
+        self.assertEqual(Path([7], 5).getFirstStep(), None)
+
+    def test_coordinates_lazy(self):
+        """
+        Test coordinates are only decoded when asked for.
+        """
+        self.assertEqual(self.path.coords, None)
+        self.path.getFirstStep()
+        self.assertEqual(self.path.coords, None)
+        self.assertEqual(self.path.getCoordinates(), [[0, 2], [0, 3], [1, 3], [2, 3]])
+        self.assertEqual(self.path[-1], [2, 3])
+        self.assertEqual(self.path[1:3], [[0, 3], [1, 3]])
+
+    def test_nodes(self):
+        """
+        Test the flat indices are kept as an integer array.
+        """
+        self.assertTrue(np.issubdtype(self.path.getNodes().dtype, np.integer))
+        self.assertEqual(self.path.getNodes().tolist(), [2, 3, 8, 13])
+
+    def test_compare(self):
+        """
+        Test paths compare equal to lists of coordinates and to other paths.
+        """
+        self.assertEqual(self.path, [[0, 2], [0, 3], [1, 3], [2, 3]])
+        self.assertEqual(self.path, Path([2, 3, 8, 13], 5))
+        self.assertNotEqual(self.path, Path([2, 3, 8, 13], 6))
+        self.assertNotEqual(self.path, None)
+        self.assertIn([1, 3], self.path)
+        self.assertNotIn([1, 2], self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
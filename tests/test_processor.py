@@ -0,0 +1,178 @@
+"""
+Test the weighting heuristics of the Processor.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+from app.obj.Food import Food
+from app.util.Processor import Processor
+from tests.helpers import makeSnake
+
+def makeFood(positions):
+    """
+    Return a Food object holding positions.
+    """
+    return Food({'data': [{'x': x, 'y': y} for (x, y) in positions]})
+
+class TestProcessor(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def setUp(self):
+        """
+        Create a board with two snakes, one of which is next to food.
+        """
+        self.board = Board(10, 10)
+        self.us = 'us'
+        self.snakes = {
+            'us': makeSnake([[2, 2], [2, 3], [2, 4], [3, 4]], 'us'),
+            'them': makeSnake([[7, 7], [7, 8], [8, 8]], 'them'),
+        }
+        self.food = makeFood([[6, 7], [0, 9]])
+        self.processor = Processor(self.board, self.snakes, self.us, self.food)
+
+    def test_not_hit_snakes(self):
+        """
+        Ensure bodies are walls, and tails are free unless their snake can eat.
+        """
+        self.processor.weightNotHitSnakes()
+        self.board.layers.compose()
+        for coord in [[2, 2], [2, 3], [2, 4], [7, 7], [7, 8]]:
+            self.assertEqual(self.board.getWeight(coord), 0)
+        self.assertEqual(self.board.getWeight([3, 4]), 50)
+        # 'them' has food next to its head, so its tail will not move
+        self.assertEqual(self.board.getWeight([8, 8]), 0)
+        self.assertEqual(self.board.getWeight([5, 5]), 50)
+
+    def test_unchanged_turn_reused(self):
+        """
+        Ensure a turn where nothing moved neither rebuilds nor recomposes.
+        """
+        heuristics = [self.processor.weightNotHitSnakes, self.processor.weightFood,
+                      self.processor.weightSmallSnakes, self.processor.weightLargeSnakes,
+                      self.processor.weightSafeTails]
+        for heuristic in heuristics:
+            heuristic()
+        self.board.layers.compose()
+        layers = {name: self.board.layers.get(name) for (name, _) in self.board.layers.order}
+        version = self.board.weightVersion
+
+        for heuristic in heuristics:
+            heuristic()
+        self.assertFalse(self.board.layers.changed)
+        for (name, weights) in layers.items():
+            self.assertIs(self.board.layers.get(name), weights)
+        self.board.layers.compose()
+        self.assertEqual(self.board.weightVersion, version)
+
+        # moving a snake rebuilds the layers built from snakes, but not food
+        self.snakes['them'] = makeSnake([[7, 6], [7, 7], [7, 8]], 'them')
+        for heuristic in heuristics:
+            heuristic()
+        self.assertIsNot(self.board.layers.get('snakes'), layers['snakes'])
+        self.assertIs(self.board.layers.get('food'), layers['food'])
+        self.board.layers.compose()
+        self.assertEqual(self.board.getWeight([7, 6]), 0)
+
+    def test_no_snakes_left(self):
+        """
+        Ensure bodies from an earlier turn are dropped once no snakes are left.
+        """
+        self.processor.weightNotHitSnakes()
+        self.snakes.clear()
+        self.processor.weightNotHitSnakes()
+        self.assertIsNone(self.board.layers.get('snakes'))
+        self.board.layers.compose()
+        self.assertEqual(self.board.getWeight([2, 3]), 50)
+
+    def test_occupancy_and_food_masks(self):
+        """
+        Ensure masks mark every body square and every food square.
+        """
+        occupied = self.processor.occupancyMask()
+        self.assertEqual(int(occupied.sum()), 7)
+        self.assertTrue(occupied[3, 4] and occupied[8, 8])
+        food = self.processor.foodMask()
+        self.assertEqual(int(food.sum()), 2)
+        self.assertTrue(food[6, 7] and food[0, 9])
+
+    def test_no_food_yet(self):
+        """
+        Ensure food heuristics work before the server has sent any food.
+        """
+        self.processor.food = Food({})
+        self.assertFalse(self.processor.foodMask().any())
+        self.processor.weightFood()
+        self.assertTrue(np.isnan(self.board.layers.get('food')).all())
+
+    def test_head_area_shapes(self):
+        """
+        Ensure head areas are clipped to the board and leave out bodies.
+        """
+        them = self.snakes['them']
+        square = self.processor.headArea(them)
+        # full 5x5 square, less the 3 body squares in it
+        self.assertEqual(int(square.sum()), 25 - 3)
+        corner = self.processor.headArea(makeSnake([[0, 0]], 'corner'))
+        # clipped to 3x3 in the corner, less our head at [2, 2]
+        self.assertEqual(int(corner.sum()), 9 - 1)
+        self.assertFalse(square[7, 7] or square[8, 8])
+        self.assertTrue(square[5, 5] and square[9, 9])
+
+        diamond = self.processor.headArea(them, radius=1, shape='manhattan')
+        self.assertEqual(sorted(zip(*np.nonzero(diamond))), [(6, 7), (7, 6), (8, 7)])
+        self.assertRaises(ValueError, self.processor.headArea, them, 1, 'circle')
+
+    def test_small_snakes(self):
+        """
+        Ensure the bonus lands around the heads of smaller snakes only.
+        """
+        self.processor.weightSmallSnakes()
+        self.board.layers.compose()
+        self.assertEqual(self.board.getWeight([5, 5]), 62)
+        self.assertEqual(self.board.getWeight([7, 7]), 50)
+        self.assertEqual(self.board.getWeight([2, 0]), 50)
+        self.assertEqual(self.board.getWeight([4, 5]), 50)
+
+    def test_large_and_safe_tails(self):
+        """
+        Ensure neighbours of larger heads are walls, and safe tails are freed.
+        """
+        self.snakes['them'] = makeSnake([[7, 7], [7, 8], [8, 8], [9, 8], [9, 9]], 'them')
+        self.snakes['edge'] = makeSnake([[0, 5], [0, 6]], 'edge')
+        self.processor.weightNotHitSnakes()
+        self.processor.weightLargeSnakes()
+        self.processor.weightSafeTails()
+        self.board.layers.compose()
+        for coord in [[6, 7], [8, 7], [7, 6]]:
+            self.assertEqual(self.board.getWeight(coord), 0)
+        self.assertEqual(self.board.getWeight([1, 5]), 50)
+
+        # 'them' is next to food, 'edge' is not
+        tails = self.board.layers.get('tails')
+        self.assertTrue(np.isnan(tails[9, 9]))
+        self.assertEqual(tails[0, 6], 50)
+        self.assertEqual(self.board.getWeight([9, 9]), 0)
+        self.assertEqual(self.board.getWeight([0, 6]), 50)
+
+    def test_one_composition(self):
+        """
+        Ensure the heuristics leave the board alone until the layers are composed.
+        """
+        self.processor.weightNotHitSnakes()
+        self.processor.weightFood()
+        self.processor.weightSmallSnakes()
+        self.processor.weightLargeSnakes()
+        self.assertEqual(self.board.getWeight([2, 2]), 50)
+        self.board.layers.compose()
+        self.assertEqual(self.board.getWeight([2, 2]), 0)
+        self.assertEqual(self.board.getWeight([0, 9]), 100)
+        # 'them' is smaller than us, so its head area gets the bonus
+        self.assertEqual(self.board.getWeight([5, 5]), 62)
+        self.assertEqual(self.board.getWeight([6, 7]), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test the labelling of free regions of the board.
+"""
+
+import unittest
+from unittest.mock import Mock
+from app.util.DisjointSet import DisjointSet
+from app.util.ReachableSpace import ReachableSpace
+from tests.helpers import makeSnake
+
+class TestReachableSpace(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def setUp(self):
+        """
+        Create a 5x5 board split in two by a vertical snake at x = 2.
+        """
+        self.board = Mock(width=5, height=5)
+        self.snakes = {
+            'wall': makeSnake([[2, 0], [2, 1], [2, 2], [2, 3], [2, 4], [3, 4]]),
+        }
+        self.space = ReachableSpace(self.board, self.snakes)
+        self.space.update()
+
+    def test_regions(self):
+        """
+        Ensure bodies split the board, and tails do not.
+        """
+        labels = self.space.getLabels()
+        self.assertEqual(labels[2, 2], DisjointSet.WALL)
+        self.assertNotEqual(labels[0, 0], labels[4, 0])
+        self.assertNotEqual(labels[3, 4], DisjointSet.WALL)  # tail moves away
+        self.assertEqual(labels[3, 4], labels[4, 0])
+
+    def test_get_area(self):
+        """
+        Ensure areas add up every region next to a square.
+        """
+        self.assertEqual(self.space.getArea([0, 0]), 10)
+        self.assertEqual(self.space.getArea([4, 4]), 10)
+        # the head touches both sides
+        self.assertEqual(self.space.getArea([2, 0]), 20)
+
+    def test_free_times(self):
+        """
+        Ensure each segment is free one turn after the segment behind it.
+        """
+        self.snakes['stacked'] = makeSnake([[0, 0], [0, 0], [0, 0]])
+        self.space.update()
+        freeTimes = self.space.getFreeTimes()
+        self.assertEqual([int(freeTimes[2, y]) for y in range(5)], [6, 5, 4, 3, 2])
+        self.assertEqual(freeTimes[3, 4], 1)
+        self.assertEqual(freeTimes[4, 4], 0)
+        self.assertEqual(freeTimes[0, 0], 3)
+
+    def test_escapable_area(self):
+        """
+        Ensure squares count once their body has moved away by the time we arrive.
+        """
+        # [4, 4] reaches the right side at once, and the left side through
+        # the body squares that clear from the tail end
+        self.assertEqual(self.space.getEscapableArea([4, 4]), 24)
+        # a snake's own head is reached from behind once its tail catches up
+        self.snakes['wall'] = makeSnake([[1, 1], [1, 2], [2, 2], [2, 1]])
+        self.space.update()
+        self.assertEqual(self.space.getEscapableArea([1, 1]), 24)
+        self.assertEqual(self.space.getArea([1, 1]), 22)
+
+    def test_escapable_area_sealed_pocket(self):
+        """
+        Ensure a long snake sealed in a pocket only counts the pocket, even
+        though the walls around it clear long after it would have to wait.
+        """
+        board = Mock(width=11, height=11)
+        them = [[2, 0], [2, 1], [2, 2], [1, 2]] + [[1, y] for y in range(3, 11)] \
+            + [[x, 10] for x in range(2, 11)] + [[10, y] for y in range(9, 4, -1)]
+        snakes = {
+            'us': makeSnake([[0, y] for y in range(10)], 'us'),
+            'them': makeSnake(them, 'them'),
+        }
+        space = ReachableSpace(board, snakes)
+        space.update()
+        self.assertEqual(space.getArea([0, 0]), 2)
+        self.assertLessEqual(space.getEscapableArea([0, 0]), 2)
+
+    def test_escapable_area_trapped(self):
+        """
+        Ensure nothing is escapable when every move is blocked.
+        """
+        snakes = {'coiled': makeSnake([[0, 0], [0, 1], [1, 1], [1, 0], [2, 0]])}
+        space = ReachableSpace(Mock(width=5, height=5), snakes)
+        space.update()
+        self.assertEqual(space.getEscapableArea([0, 0]), 0)
+
+    def test_labels_on_demand(self):
+        """
+        Ensure updating only labels the regions once they are asked for.
+        """
+        self.space.update()
+        self.assertFalse(self.space.labelled)
+        self.assertEqual(self.space.getArea([0, 0]), 10)
+        self.assertTrue(self.space.labelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
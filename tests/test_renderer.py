@@ -0,0 +1,83 @@
+"""
+Test drawing board weights without a display.
+"""
+
+import colorsys
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+import numpy as np
+from app.Board import Board
+from app.util.Renderer import Renderer
+
+class TestRenderer(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def setUp(self):
+        """
+        Create a fresh board with a wall and a fully weighted square.
+        """
+        self.board = Board(6, 4)
+        self.board.setWeight([1, 2], 0)
+        self.board.setWeight([4, 1], 100)
+        self.renderer = Renderer(self.board)
+
+    def test_hsv_matches_colorsys(self):
+        """
+        Ensure the vectorized conversion agrees with colorsys.
+        """
+        hues = np.linspace(0, 0.99, 37)
+        rgb = Renderer.hsvToRgb(hues, 0.8, 0.9)
+        for hue, colour in zip(hues, rgb):
+            expected = colorsys.hsv_to_rgb(hue, 0.8, 0.9)
+            self.assertTrue(np.allclose(colour, expected))
+
+    def test_render(self):
+        """
+        Ensure images are rows of y, with walls, full squares and paths coloured.
+        """
+        path = self.board.optimumPath([0, 0], [5, 0])
+        image = self.renderer.render(path)
+        self.assertEqual(image.shape, (4, 6, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(tuple(image[2, 1]), Renderer.WALL_COLOUR)
+        self.assertEqual(tuple(image[1, 4]), Renderer.FULL_COLOUR)
+        for (x, y) in path:
+            self.assertEqual(tuple(image[y, x]), Renderer.PATH_COLOUR)
+
+        self.assertEqual(self.renderer.render(scale=3).shape, (12, 18, 3))
+
+    def test_write_png(self):
+        """
+        Ensure PNG files hold the rendered pixels.
+        """
+        image = self.renderer.render(scale=2)
+        filename = os.path.join(tempfile.mkdtemp(), 'frame.png')
+        self.renderer.toPNG(filename, scale=2)
+        with open(filename, 'rb') as pngFile:
+            data = pngFile.read()
+
+        self.assertEqual(data[:8], b'\x89PNG\r\n\x1a\n')
+        (width, height) = struct.unpack('>II', data[16:24])
+        self.assertEqual((width, height), (12, 8))
+        length = struct.unpack('>I', data[33:37])[0]
+        rows = np.frombuffer(zlib.decompress(data[41:41 + length]), dtype=np.uint8)
+        rows = rows.reshape(height, width * 3 + 1)
+        self.assertTrue((rows[:, 1:].reshape(height, width, 3) == image).all())
+
+    def test_ansi(self):
+        """
+        Ensure terminal output has one line per row, with weights if asked.
+        """
+        lines = self.renderer.toAnsi(numbers=True).split('\n')
+        self.assertEqual(len(lines), 4)
+        self.assertIn('100', lines[1])
+        self.assertIn('\033[48;2;0;0;0m  0', lines[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
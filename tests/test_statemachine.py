@@ -3,8 +3,12 @@ Test state transitions, game operation.
 """
 
 import unittest
+import numpy as np
 from unittest.mock import Mock
+from app.Board import Board
+from app.obj.Food import Food
 from app.util.StateMachine import StateMachine
+from tests.helpers import makeSnake
 
 class TestStateMachine(unittest.TestCase):
     """
@@ -15,11 +19,14 @@ class TestStateMachine(unittest.TestCase):
         """
         Create a fresh StateMachine object.
         """
-        self.board = Mock()
+        self.board = Mock(width=20, height=20)
         self.food = Mock()
 
         otherSnake = Mock()
+        otherSnake.getAllPositions.return_value = [[15, 15], [15, 16], [15, 17]]
         ourSnake = Mock()
+        ourSnake.getAllPositions.return_value = [[10, 0], [11, 0], [12, 0]]
+        ourSnake.getHeadPosition.return_value = [10, 0]
         self.us = "glorious-us-uuid"
         self.snakes = {"mean-snake-uuid": otherSnake, self.us: ourSnake}
 
@@ -71,7 +78,7 @@ class TestStateMachine(unittest.TestCase):
 
         self.food.getPositions.return_value = [[0, 0]]
         ourSnake.getHealth.return_value = 30
-        self.board.optimumPathLength.return_value = 40
+        self.board.distanceField.return_value = np.full((20, 20), 40.0)
         self.machine.step()
         self.assertEqual(self.machine.getState(), "STARVING")
 
@@ -93,16 +100,115 @@ class TestStateMachine(unittest.TestCase):
         Test pathToFoodLess(value) utility function.
         """
         ourSnake = self.snakes[self.us]
+        distances = np.arange(400, dtype=float).reshape(20, 20)
+        self.board.distanceField.return_value = distances
+
+        self.food.getPositions.return_value = [[0, 10]]
+        ourSnake.getHeadPosition.return_value = [10, 0]
+        # 10 moves away, so 11 squares counting both ends
+        self.assertTrue(self.machine.pathToFoodLess(12))
+        self.assertFalse(self.machine.pathToFoodLess(11))
+        self.board.distanceField.assert_called_once_with([10, 0], weighted=False)
+
+        self.machine.startTurn()
+        self.food.getPositions.return_value = [[0, 3], [0, 1], [0, 2]]
+        self.assertTrue(self.machine.pathToFoodLess(3))
+        self.assertFalse(self.machine.pathToFoodLess(2))
+
+        self.machine.startTurn()
+        self.food.getPositions.return_value = []
+        self.assertFalse(self.machine.pathToFoodLess(1000))
+
+    def test_food_distance_counts_squares(self):
+        """
+        Ensure food distances count path squares, as optimumPathLength does.
+        """
+        board = Board(7, 7)
+        snakes = {'us': makeSnake([[3, 3], [3, 4]], 'us')}
+        for food in ([4, 3], [0, 0]):
+            machine = StateMachine(board, snakes, 'us', Food({'data': [{'x': food[0], 'y': food[1]}]}))
+            self.assertEqual(machine.nearestFoodDistance(), board.optimumPathLength(food, [3, 3]))
 
-        self.board.optimumPathLength.return_value = 10
-        self.food.getPositions.return_value = [[0, 0]] # these don't matter since optimumPathLength()
-        ourSnake.getHeadPosition.return_value = [10, 0] # return value is constantly defined
-        self.assertTrue(self.machine.pathToFoodLess(11))
-        self.assertFalse(self.machine.pathToFoodLess(10))
+    def test_measured_once_per_turn(self):
+        """
+        Ensure the cached measurements are only dropped when the turn changes.
+        """
+        self.food.getPositions.return_value = [[0, 0]]
+        self.board.distanceField.return_value = np.full((20, 20), 5.0)
+        self.machine.startTurn(3)
+        self.assertTrue(self.machine.pathToFoodLess(7))
+        self.assertFalse(self.machine.availableSpaceLess(100))
+
+        self.board.distanceField.return_value = np.full((20, 20), 50.0)
+        self.machine.startTurn(3)
+        self.assertTrue(self.machine.pathToFoodLess(7))
+        self.machine.startTurn(4)
+        self.assertFalse(self.machine.pathToFoodLess(7))
+        self.assertEqual(self.board.distanceField.call_count, 2)
+
+    def test_available_space_less(self):
+        """
+        Test availableSpaceLess(value) against the space around our head.
+        """
+        ourSnake = self.snakes[self.us]
+        # everything but our head, which we have only just left
+        self.assertTrue(self.machine.availableSpaceLess(400))
+        self.assertFalse(self.machine.availableSpaceLess(399))
+
+        # wall ourselves into the corner, leaving only [0, 1] free. Our body
+        # is too long to move out of the way before we are stuck there
+        ourSnake.getAllPositions.return_value = [[0, 0], [1, 0], [1, 1], [1, 2],
+                                                 [0, 2], [0, 3], [0, 4], [0, 5]]
+        ourSnake.getHeadPosition.return_value = [0, 0]
+        self.assertFalse(self.machine.availableSpaceLess(1))  # still measuring last turn
+        self.machine.startTurn()
+        self.assertTrue(self.machine.availableSpaceLess(2))
+        self.assertFalse(self.machine.availableSpaceLess(1))
+
+        # one square shorter, and we follow our tail out of the corner
+        ourSnake.getAllPositions.return_value = [[0, 0], [1, 0], [1, 1], [1, 2],
+                                                 [0, 2], [0, 3]]
+        self.machine.startTurn()
+        self.assertFalse(self.machine.availableSpaceLess(300))
+
+    def test_space_measured_once_per_step(self):
+        """
+        Ensure the board is only labelled once, however many thresholds are checked.
+        """
+        ourSnake = self.snakes[self.us]
+        ourSnake.getSize.return_value = 300
+        ourSnake.getHealth.return_value = 20
+        self.food.getPositions.return_value = [[0, 0]]
+        self.board.distanceField.return_value = np.ones((20, 20))
+        self.machine.setState('HUNGRY')
+        self.machine.space.update = Mock(wraps=self.machine.space.update)
+        self.machine.step()
+        self.assertEqual(self.machine.getState(), 'CONFINED')
+        self.machine.step()
+        self.assertEqual(self.machine.space.update.call_count, 2)
 
-        self.board.optimumPathLength.return_value = 1
-        self.food.getPositions.return_value = [[0, 0], [0, 1], [0, 2]]
-        self.assertTrue(self.machine.pathToFoodLess(2))
+    def test_confined_in_sealed_pocket(self):
+        """
+        Ensure a long snake sealed in a small pocket on a real board is
+        confined, even though the walls around it clear much later.
+        """
+        them = [[2, 0], [2, 1], [2, 2], [1, 2]] + [[1, y] for y in range(3, 11)] \
+            + [[x, 10] for x in range(2, 11)] + [[10, y] for y in range(9, 4, -1)]
+        snakes = {
+            'us': makeSnake([[0, y] for y in range(10)], 'us'),
+            'them': makeSnake(them, 'them'),
+        }
+        food = Food({'data': [{'x': 5, 'y': 5}]})
+        machine = StateMachine(Board(11, 11), snakes, 'us', food)
+        machine.step(1)
+        self.assertEqual(machine.getState(), 'CONFINED')
+        self.assertEqual(machine.availableSpace, 2)
+
+        # without the other snake the same body has room to spare
+        del snakes['them']
+        machine = StateMachine(Board(11, 11), snakes, 'us', food)
+        machine.step(1)
+        self.assertEqual(machine.getState(), 'IDLE')
 
 
 if __name__ == "__main__":
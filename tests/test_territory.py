@@ -0,0 +1,80 @@
+"""
+Test splitting the board between snakes.
+"""
+
+import unittest
+import numpy as np
+from app.Board import Board
+from app.util.Territory import Territory
+from tests.helpers import makeSnake
+
+class TestTerritory(unittest.TestCase):
+    """
+    Parent class to run unittests.
+    """
+
+    def test_split_between_two_snakes(self):
+        """
+        Ensure each snake owns the squares it reaches first.
+        """
+        board = Board(5, 5)
+        snakes = {
+            'left': makeSnake([[0, 2], [0, 3], [0, 4]]),
+            'right': makeSnake([[4, 2], [4, 3], [4, 4]]),
+        }
+        territory = Territory(board, snakes)
+        territory.update()
+
+        self.assertEqual(territory.getOwner([1, 0]), 'left')
+        self.assertEqual(territory.getOwner([3, 4]), 'right')
+        # the middle column is reached by both heads on the same move
+        for y in range(5):
+            self.assertEqual(territory.getOwner([2, y]), None)
+        self.assertEqual(int(territory.getContested().sum()), 5)
+        # bodies are walls, but tails will have moved on
+        self.assertEqual(territory.getOwner([0, 3]), None)
+        self.assertEqual(territory.getOwner([0, 4]), 'left')
+
+        counts = territory.getCellCounts()
+        self.assertEqual(counts['left'], counts['right'])
+        # 25 squares, less 5 contested, 2 heads and 2 body segments, shared
+        self.assertEqual(counts['left'], 8)
+
+    def test_walled_off_snake(self):
+        """
+        Ensure a snake boxed in by bodies only owns its pocket.
+        """
+        board = Board(6, 6)
+        snakes = {
+            'boxed': makeSnake([[0, 0], [0, 1]]),
+            'wall': makeSnake([[3, 0], [2, 0], [2, 1], [2, 2], [1, 2], [0, 2], [0, 3]]),
+        }
+        territory = Territory(board, snakes)
+        territory.update()
+
+        # its own tail square is free again by the time it gets there
+        self.assertEqual(territory.getCellCounts()['boxed'], 3)
+        self.assertEqual(territory.getOwner([1, 0]), 'boxed')
+        self.assertEqual(territory.getOwner([1, 1]), 'boxed')
+        self.assertEqual(territory.getOwner([0, 1]), 'boxed')
+        self.assertTrue(np.isinf(territory.distances[2, 2]))
+        self.assertEqual(territory.getOwner([5, 5]), 'wall')
+
+    def test_ownership_shape(self):
+        """
+        Ensure the ownership map covers the board and indexes getOrder().
+        """
+        board = Board(7, 4)
+        snakes = {'only': makeSnake([[3, 2], [3, 3]])}
+        territory = Territory(board, snakes)
+        territory.update()
+
+        owners = territory.getOwnership()
+        self.assertEqual(owners.shape, (7, 4))
+        self.assertEqual(territory.getOrder(), ['only'])
+        self.assertEqual(int((owners == 0).sum()), 7 * 4)
+        self.assertEqual(territory.getCellCounts(), {'only': 7 * 4 - 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Compare the DisjointSet update backends on common board sizes."""
+
+import timeit
+from optparse import OptionParser
+import numpy as np
+from app.Board import Board
+from app.util.DisjointSet import DisjointSet
+
+
+def makeBoard(width, height, density, seed):
+    """
+    Build a board with a share of its squares walled at random.
+
+    param1: int - board width
+    param2: int - board height
+    param3: float - share of squares that are walls
+    param4: int - random seed, so every backend sees the same board
+    return: Board - weighted board
+    """
+    rng = np.random.RandomState(seed)
+    board = Board(width, height)
+    board.setWeights(rng.rand(width, height) < density, 0)
+    return board
+
+
+def timeUpdate(board, backend, repeat):
+    """
+    Time one full update() of a DisjointSet.
+
+    return: float - best time per update in microseconds
+    """
+    dset = DisjointSet(board, backend=backend)
+    return min(timeit.repeat(dset.update, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def timeMove(board, repeat):
+    """
+    Time one incremental updateCells() of a snake's head and tail moving.
+    Both squares swap back every other call, so the board never drifts.
+
+    return: float - best time per move in microseconds
+    """
+    dset = DisjointSet(board)
+    dset.update()
+    (head, tail) = ([0, 0], [board.width - 1, board.height - 1])
+    board.setWeights([head, tail], 50)
+    dset.updateCells([head, tail], [])
+    moves = [([tail], [head]), ([head], [tail])]
+
+    def move():
+        for (freed, blocked) in moves:
+            dset.updateCells(freed, blocked)
+
+    return min(timeit.repeat(move, number=repeat, repeat=5)) / repeat / 2 * 1e6
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('-n', '--number', dest='number', type='int', default=50,
+                      help='updates per timing run')
+    parser.add_option('-s', '--sizes', dest='sizes', default='5,7,11,19,50',
+                      help='comma separated square board sizes')
+    parser.add_option('-d', '--density', dest='density', type='float', default=0.2,
+                      help='share of squares that are walls')
+    (options, _) = parser.parse_args()
+
+    print('| Board | unionfind (us) | label (us) | Faster | updateCells (us) |')
+    print('|-------|---------------:|-----------:|--------|-----------------:|')
+    for side in [int(size) for size in options.sizes.split(',')]:
+        board = makeBoard(side, side, options.density, side)
+        times = {backend: timeUpdate(board, backend, options.number)
+                 for backend in DisjointSet.BACKENDS}
+        faster = min(times, key=times.get)
+        print('| {0}x{0} | {1:.0f} | {2:.0f} | {3} | {4:.0f} |'.format(
+            side, times['unionfind'], times['label'], faster,
+            timeMove(board, options.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compare the shortest path backends of Board on common board sizes."""
+
+import timeit
+from optparse import OptionParser
+import numpy as np
+from app.Board import Board
+
+
+def makeBoard(width, height, engine, seed):
+    """
+    Build a board with snake-like walls and mixed weights.
+
+    param1: int - board width
+    param2: int - board height
+    param3: string - Board engine
+    param4: int - random seed, so every engine sees the same board
+    return: Board - weighted board
+    """
+    rng = np.random.RandomState(seed)
+    board = Board(width, height, engine=engine)
+    size = width * height
+    for _ in range(size // 5):
+        board.setWeight([int(rng.randint(width)), int(rng.randint(height))], 0)
+    for _ in range(size // 5):
+        board.setWeight([int(rng.randint(width)), int(rng.randint(height))],
+                        int(rng.randint(1, 101)))
+    return board
+
+
+def makeEnclosedBoard(width, height, engine):
+    """
+    Build a board where the corner [0, 0] is walled into a 3x4 pocket.
+
+    return: Board - weighted board
+    """
+    board = Board(width, height, engine=engine)
+    board.setWeights([[3, y] for y in range(4)] + [[x, 4] for x in range(4)], 0)
+    return board
+
+
+def timeEngine(width, height, engine, enclosed, repeat):
+    """
+    Time one uncached single-source search. Open boards search from the
+    middle, enclosed boards from inside the corner pocket.
+
+    return: float - best time per search in microseconds
+    """
+    if enclosed:
+        board = makeEnclosedBoard(width, height, engine)
+        start = 0
+    else:
+        board = makeBoard(width, height, engine, width * height)
+        start = (width // 2) * height + height // 2
+        board.setWeight([width // 2, height // 2], 50)
+
+    def search():
+        board.pathCache.clear()
+        board.shortestPathTree(start)
+
+    return min(timeit.repeat(search, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('-n', '--number', dest='number', type='int', default=200,
+                      help='searches per timing run')
+    parser.add_option('-s', '--sizes', dest='sizes', default='11,19,50',
+                      help='comma separated square board sizes')
+    (options, _) = parser.parse_args()
+
+    print('| Board | Start | scipy (us) | bucket (us) | Faster |')
+    print('|-------|-------|-----------:|------------:|--------|')
+    for side in [int(size) for size in options.sizes.split(',')]:
+        for enclosed in (False, True):
+            times = {engine: timeEngine(side, side, engine, enclosed, options.number)
+                     for engine in Board.ENGINES}
+            faster = min(times, key=times.get)
+            print('| {0}x{0} | {1} | {2:.0f} | {3:.0f} | {4} |'.format(
+                side, 'enclosed' if enclosed else 'open', times['scipy'],
+                times['bucket'], faster))
+
+
+if __name__ == '__main__':
+    main()